@@ -14,12 +14,10 @@ _env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
 if os.path.exists(_env_path):
     load_dotenv(_env_path)
 
-from openai import OpenAI
-
 # Import do query engine (mesmo diretorio)
 import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from query import AkashaQuery
+from query import AkashaQuery, get_openai_client
 
 
 class AkashaOracle:
@@ -48,9 +46,19 @@ FORMATO DA RESPOSTA:
 - Nivel de confianca: ALTO (multiplas fontes), MEDIO (uma fonte), BAIXO (inferencia parcial)
 """
 
+    # Top-K e orcamento de contexto adaptativos por complexidade
+    SEARCH_LIMITS = {"fast": 2, "balanced": 5, "deep": 8}
+    CONTEXT_CHARS = {"fast": 4000, "balanced": 16000, "deep": 24000}
+
+    # Compactacao do historico multi-turn
+    HISTORY_TOKEN_BUDGET = 8000   # tokens estimados antes de resumir
+    HISTORY_KEEP_MESSAGES = 6     # ultimas 3 trocas ficam literais
+    SUMMARY_MODEL = "gpt-4o-mini"
+    SUMMARY_PREFIX = "CONTEXTO ATE AGORA (resumo das trocas anteriores):"
+
     def __init__(self, default_model: str = "fast"):
         self.query_engine = AkashaQuery()
-        self.openai = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self.openai = get_openai_client()
         self.default_model = default_model
         self.conversation_history = []
 
@@ -60,13 +68,53 @@ FORMATO DA RESPOSTA:
             return self.MODELS[complexity]
         return self.MODELS[self.default_model]
 
+    @staticmethod
+    def _estimate_tokens(messages: list) -> int:
+        """Estimativa barata de tokens (~4 caracteres por token)."""
+        return sum(len(m.get("content") or "") for m in messages) // 4
+
+    def _compact_history(self):
+        """Resume trocas antigas quando o historico passa do orcamento de tokens."""
+        if self._estimate_tokens(self.conversation_history) <= self.HISTORY_TOKEN_BUDGET:
+            return
+        if len(self.conversation_history) <= self.HISTORY_KEEP_MESSAGES:
+            return
+
+        older = self.conversation_history[:-self.HISTORY_KEEP_MESSAGES]
+        recent = self.conversation_history[-self.HISTORY_KEEP_MESSAGES:]
+
+        transcript = "\n\n".join(f"{m['role'].upper()}: {m['content']}" for m in older)
+        try:
+            response = self.openai.chat.completions.create(
+                model=self.SUMMARY_MODEL,
+                messages=[
+                    {"role": "system", "content": (
+                        "Resuma a conversa abaixo em ate 200 tokens, em portugues. "
+                        "Preserve perguntas feitas, fatos respondidos e fontes citadas."
+                    )},
+                    {"role": "user", "content": transcript},
+                ],
+                temperature=0,
+                max_tokens=300,
+            )
+            summary = response.choices[0].message.content
+        except Exception:
+            # Sem resumo: descarta as trocas antigas para manter o prompt limitado
+            self.conversation_history = recent
+            return
+
+        self.conversation_history = [
+            {"role": "system", "content": f"{self.SUMMARY_PREFIX}\n{summary}"}
+        ] + recent
+
     def _build_context(self, search_results: list, max_chars: int = 16000) -> str:
         """Constroi contexto dos documentos encontrados."""
         if not search_results:
             return "NENHUM DOCUMENTO RELEVANTE ENCONTRADO."
 
-        context_parts = []
-        total_chars = 0
+        # Pecas [header, content, ""] por documento: um unico join no final
+        parts = []
+        budget = max_chars
 
         for i, result in enumerate(search_results):
             filename = result.get("filename", "unknown")
@@ -76,26 +124,49 @@ FORMATO DA RESPOSTA:
 
             header = f"--- DOCUMENTO {i+1}: {filename} ({file_type}) [Relevancia: {score:.3f}] ---"
 
-            remaining = max_chars - total_chars - len(header) - 50
-            if remaining <= 0:
+            take = budget - len(header) - 50
+            if take <= 0:
                 break
 
-            content = snippet[:remaining] if snippet else "(sem conteudo extraido)"
+            content = snippet[:take] if snippet else "(sem conteudo extraido)"
 
-            block = f"{header}\n{content}\n"
-            context_parts.append(block)
-            total_chars += len(block)
+            parts += (header, content, "")
+            budget -= len(header) + len(content) + 2
 
-        return "\n".join(context_parts)
+        return "\n".join(parts)
 
     def ask(self, question: str, complexity: str = None,
-            search_limit: int = 5, search_mode: str = "hybrid") -> dict:
+            search_limit: int = None, search_mode: str = "hybrid") -> dict:
         """
         Faz uma pergunta ao Oracle.
         """
+        stream = self.ask_stream(question, complexity, search_limit, search_mode)
+        while True:
+            try:
+                next(stream)
+            except StopIteration as stop:
+                return stop.value
+
+    def ask_stream(self, question: str, complexity: str = None,
+                   search_limit: int = None, search_mode: str = "hybrid"):
+        """
+        Variante streaming de ask(): produz os tokens da resposta conforme chegam.
+        O dict final (mesmo formato de ask) e o valor de retorno do gerador.
+        Sem search_limit explicito, o top-K segue a complexidade (2/5/8).
+        """
         start_time = datetime.now()
 
-        # 1. Buscar documentos relevantes
+        # 1. Auto-detect complexity (define top-K e tamanho do contexto)
+        if not complexity:
+            if len(question) > 200 or "analise" in question.lower() or "compare" in question.lower():
+                complexity = "balanced"
+            else:
+                complexity = "fast"
+
+        if search_limit is None:
+            search_limit = self.SEARCH_LIMITS.get(complexity, 5)
+
+        # 2. Buscar documentos relevantes
         search_results = self.query_engine.search(question, mode=search_mode, limit=search_limit)
 
         if not search_results:
@@ -108,15 +179,10 @@ FORMATO DA RESPOSTA:
                 "cost_estimate": 0.0001,
             }
 
-        # 2. Construir contexto
-        context = self._build_context(search_results)
-
-        # 3. Auto-detect complexity
-        if not complexity:
-            if len(question) > 200 or "analise" in question.lower() or "compare" in question.lower():
-                complexity = "balanced"
-            else:
-                complexity = "fast"
+        # 3. Construir contexto
+        context = self._build_context(
+            search_results, max_chars=self.CONTEXT_CHARS.get(complexity, 16000)
+        )
 
         model = self._select_model(complexity)
 
@@ -132,10 +198,9 @@ PERGUNTA DO USUARIO:
 Responda baseado APENAS nos documentos acima. Cite as fontes."""}
         ]
 
-        # Adicionar historico se houver (multi-turn)
+        # Adicionar historico se houver (multi-turn); ja compactado por _compact_history
         if self.conversation_history:
-            history_msgs = self.conversation_history[-6:]
-            messages = [messages[0]] + history_msgs + [messages[1]]
+            messages = [messages[0]] + self.conversation_history + [messages[1]]
 
         # 5. Chamar LLM
         try:
@@ -144,12 +209,27 @@ Responda baseado APENAS nos documentos acima. Cite as fontes."""}
                 messages=messages,
                 temperature=0.3,
                 max_tokens=1500,
+                stream=True,
+                stream_options={"include_usage": True},
             )
 
-            answer = response.choices[0].message.content
+            parts = []
+            usage = None
+            for chunk in response:
+                # O ultimo chunk traz apenas o usage (choices vazio)
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
 
-            input_tokens = response.usage.prompt_tokens
-            output_tokens = response.usage.completion_tokens
+            answer = "".join(parts)
+
+            input_tokens = usage.prompt_tokens if usage else 0
+            output_tokens = usage.completion_tokens if usage else 0
 
             cost_rates = {
                 "gpt-4o-mini": {"input": 0.15 / 1_000_000, "output": 0.60 / 1_000_000},
@@ -171,11 +251,11 @@ Responda baseado APENAS nos documentos acima. Cite as fontes."""}
             }
 
         # 6. Extrair fontes citadas
-        sources = []
-        for r in search_results:
-            fn = r.get("filename", "")
-            if fn and fn.lower() in answer.lower():
-                sources.append(fn)
+        answer_lower = answer.lower()
+        sources = [
+            fn for fn in (r.get("filename", "") for r in search_results)
+            if fn and fn.lower() in answer_lower
+        ]
 
         if not sources:
             sources = [r.get("filename", "unknown") for r in search_results[:3]]
@@ -193,6 +273,7 @@ Responda baseado APENAS nos documentos acima. Cite as fontes."""}
         # 8. Salvar no historico
         self.conversation_history.append({"role": "user", "content": question})
         self.conversation_history.append({"role": "assistant", "content": answer})
+        self._compact_history()
 
         elapsed = (datetime.now() - start_time).total_seconds()
 
@@ -208,11 +289,15 @@ Responda baseado APENAS nos documentos acima. Cite as fontes."""}
 
     def format_answer(self, result: dict) -> str:
         """Formata resposta para exibicao."""
+        return "\n".join([self.format_header(), result["answer"], self.format_footer(result)])
+
+    def format_header(self) -> str:
+        """Cabecalho da resposta (impresso antes do streaming)."""
+        return "\n".join(["AKASHA ORACLE", "=" * 50, ""])
+
+    def format_footer(self, result: dict) -> str:
+        """Rodape com metadados (impresso apos o streaming)."""
         lines = [
-            "AKASHA ORACLE",
-            "=" * 50,
-            "",
-            result["answer"],
             "",
             "-" * 50,
             f"Confianca: {result['confidence']}",
@@ -230,7 +315,8 @@ def main():
     parser = argparse.ArgumentParser(description="Akasha Oracle — RAG Q&A")
     parser.add_argument("question", nargs="?", help="Your question")
     parser.add_argument("--complexity", choices=["fast", "balanced", "deep"], default=None)
-    parser.add_argument("--limit", type=int, default=5, help="Search result limit")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Search result limit (default: by complexity, 2/5/8)")
     parser.add_argument("--mode", default="hybrid", choices=["keyword", "semantic", "hybrid"])
     parser.add_argument("--json", action="store_true")
 
@@ -238,12 +324,28 @@ def main():
     oracle = AkashaOracle()
 
     if args.question:
-        result = oracle.ask(args.question, args.complexity, args.limit, args.mode)
-
         if args.json:
+            result = oracle.ask(args.question, args.complexity, args.limit, args.mode)
             print(json.dumps(result, indent=2, default=str, ensure_ascii=False))
         else:
-            print(oracle.format_answer(result))
+            print(oracle.format_header())
+            stream = oracle.ask_stream(args.question, args.complexity, args.limit, args.mode)
+            streamed = False
+            while True:
+                try:
+                    token = next(stream)
+                except StopIteration as stop:
+                    result = stop.value
+                    break
+                print(token, end="", flush=True)
+                streamed = True
+            if streamed and result["confidence"] == "ERRO":
+                # O stream caiu no meio: a resposta parcial fica, seguida do erro
+                print()
+            if not streamed or result["confidence"] == "ERRO":
+                print(result["answer"], end="")
+            print()
+            print(oracle.format_footer(result))
     else:
         print("Usage: python oracle.py 'sua pergunta' [--complexity fast] [--json]")
 
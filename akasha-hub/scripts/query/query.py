@@ -10,38 +10,146 @@ Schema real:
 """
 import os
 import json
+import sqlite3
+import hashlib
+from array import array
 
 from dotenv import load_dotenv
 _env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '.env')
 if os.path.exists(_env_path):
     load_dotenv(_env_path)
 
+import httpx
 from openai import OpenAI
 from supabase import create_client
 
+# Cache local de embeddings de queries (int8 quantizado: ~1.5KB por vetor)
+EMBEDDING_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".openclaw", "hubs", "akasha", "cache", "query_embeddings.db"
+)
+
+
+# Cliente OpenAI compartilhado entre AkashaQuery e AkashaOracle
+_openai_client = None
+
+
+def get_openai_client() -> OpenAI:
+    """Retorna o cliente OpenAI do processo, com pool HTTP keep-alive reutilizado."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            http_client=httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=50,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30,
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            ),
+        )
+    return _openai_client
+
+
+def quantize_embedding(vec: list) -> tuple:
+    """Quantiza simetricamente para int8. Retorna (scale, bytes)."""
+    peak = max((abs(v) for v in vec), default=0.0)
+    scale = peak / 127 if peak else 1.0
+    q = array("b", (max(-127, min(127, round(v / scale))) for v in vec))
+    return scale, q.tobytes()
+
+
+def dequantize_embedding(scale: float, blob: bytes) -> list:
+    """Reconstroi o vetor float a partir de (scale, bytes int8)."""
+    q = array("b")
+    q.frombytes(blob)
+    return [v * scale for v in q]
+
 
 class AkashaQuery:
     """Motor de busca hibrida para a base Akasha."""
 
     EMBEDDING_MODEL = "text-embedding-3-small"
     EMBEDDING_DIMENSIONS = 1536
+    EMBEDDING_BATCH_LIMIT = 2048  # maximo de inputs por request na API de embeddings
+    CACHE_LOOKUP_CHUNK = 900  # hashes por SELECT (abaixo do limite de 999 variaveis do SQLite)
 
-    def __init__(self):
+    def __init__(self, cache_path: str = EMBEDDING_CACHE_PATH):
         url = os.environ.get("AKASHA_SUPABASE_URL")
         key = os.environ.get("AKASHA_SUPABASE_KEY")
         if not url or not key:
             raise ValueError("Set AKASHA_SUPABASE_URL and AKASHA_SUPABASE_KEY")
 
         self.supabase = create_client(url, key)
-        self.openai = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self.openai = get_openai_client()
+        self._cache_path = cache_path  # None desativa o cache
+        self._cache = None
+
+    def _open_cache(self):
+        """Abre (ou cria) o cache SQLite de embeddings na primeira consulta.
+        Retorna None se o cache estiver desativado."""
+        if self._cache is None and self._cache_path:
+            cache_dir = os.path.dirname(self._cache_path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            conn = sqlite3.connect(self._cache_path)
+            conn.execute("""CREATE TABLE IF NOT EXISTS query_embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                scale REAL NOT NULL,
+                vec BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )""")
+            self._cache = conn
+        return self._cache
 
     def _get_embedding(self, text: str) -> list:
-        """Gera embedding para a query."""
-        response = self.openai.embeddings.create(
-            model=self.EMBEDDING_MODEL,
-            input=text,
-        )
-        return response.data[0].embedding
+        """Gera embedding para a query (com cache local int8)."""
+        return self._get_embeddings_batch([text])[0]
+
+    def _get_embeddings_batch(self, texts: list) -> list:
+        """Gera embeddings para varios textos; os que nao estao no cache vao em lotes
+        de ate EMBEDDING_BATCH_LIMIT por chamada a API. O resultado e sempre o vetor
+        int8 reconstruido, venha do cache ou da API."""
+        hashes = [hashlib.sha256(t.encode("utf-8")).hexdigest() for t in texts]
+        unique = dict(zip(hashes, texts))  # textos repetidos: uma busca e um input
+        found = {}
+        cache = self._open_cache()
+
+        if cache is not None:
+            keys = list(unique)
+            for start in range(0, len(keys), self.CACHE_LOOKUP_CHUNK):
+                chunk = keys[start:start + self.CACHE_LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                for text_hash, scale, blob in cache.execute(
+                    "SELECT text_hash, scale, vec FROM query_embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    (self.EMBEDDING_MODEL, *chunk),
+                ):
+                    found[text_hash] = dequantize_embedding(scale, blob)
+
+        misses = [h for h in unique if h not in found]
+        for start in range(0, len(misses), self.EMBEDDING_BATCH_LIMIT):
+            batch = misses[start:start + self.EMBEDDING_BATCH_LIMIT]
+            response = self.openai.embeddings.create(
+                model=self.EMBEDDING_MODEL,
+                input=[unique[h] for h in batch],
+            )
+
+            rows = []
+            for text_hash, item in zip(batch, sorted(response.data, key=lambda d: d.index)):
+                scale, blob = quantize_embedding(item.embedding)
+                found[text_hash] = dequantize_embedding(scale, blob)
+                rows.append((self.EMBEDDING_MODEL, text_hash, scale, blob))
+
+            if cache is not None:
+                cache.executemany(
+                    "INSERT OR REPLACE INTO query_embeddings (model, text_hash, scale, vec) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                cache.commit()
+
+        return [found[h] for h in hashes]
 
     def search_keyword(self, query: str, limit: int = 20) -> list:
         """Busca por keyword usando ILIKE no file_content.content."""
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Akasha Scanner - progress reporting
+Throttled progress line for the scanners' hot loops (replaces per-file print).
+"""
+import sys
+import threading
+import time
+
+
+class ScanProgress:
+    """Counter that writes one line to stderr every `every` items or `interval` seconds."""
+
+    def __init__(self, label: str, every: int = 1000, interval: float = 2.0):
+        self.label = label
+        self.every = every
+        self.interval = interval
+        self.count = 0
+        self._reported = 0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def tick(self, n: int = 1):
+        """Count n items; report if the item or time threshold was crossed."""
+        with self._lock:
+            self.count += n
+            now = time.monotonic()
+            if self.count - self._reported >= self.every or now - self._last >= self.interval:
+                self._reported = self.count
+                self._last = now
+                print(f"   ... {self.label}: {self.count}", file=sys.stderr, flush=True)
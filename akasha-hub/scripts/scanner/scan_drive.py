@@ -1,17 +1,26 @@
 #!/usr/bin/env python3
 """
 Akasha Scanner - Google Drive cataloger
-Batch processing: 50 files/request (validated)
-Checkpoint system: never reprocess files
+Batch processing: up to 1000 files/request (Drive files.list maximum)
+Checkpoint system: never reprocess files (append-only SQLite)
 Deduplication: md5Checksum
 """
 
 import os
 import json
 import pickle
+import functools
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson  # optional: faster parse of large legacy JSON checkpoints
+except ImportError:
+    orjson = None
 
 from dotenv import load_dotenv
 # Load .env from project root (3 levels up)
@@ -19,17 +28,39 @@ _env_path = Path(__file__).resolve().parents[3] / '.env'
 if _env_path.exists():
     load_dotenv(_env_path)
 
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from supabase import create_client, Client
 
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from progress import ScanProgress
+from supabase_batch import write_batched
+
 # Config
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
 TOKEN_PATH = Path.home() / '.openclaw/google_drive_token.pickle'
 CREDENTIALS_PATH = Path(os.getenv('GOOGLE_DRIVE_CREDENTIALS',
                         str(Path.home() / '.openclaw/google_drive_credentials.json')))
-CHECKPOINT_PATH = Path.home() / '.openclaw/hubs/akasha/checkpoints/scan_checkpoint.json'
+CHECKPOINT_PATH = Path.home() / '.openclaw/hubs/akasha/checkpoints/scan_checkpoint.db'
+LEGACY_CHECKPOINT_PATH = CHECKPOINT_PATH.with_suffix('.json')
+DRIVE_WORKERS = 8  # concurrent files.list() calls when descending into subfolders
+DRIVE_RETRIES = 5  # googleapiclient exponential backoff on 429/5xx
+DRIVE_MAX_PAGE_SIZE = 1000  # files.list hard limit
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+FILE_FIELDS = "nextPageToken, files(id, name, mimeType, size, md5Checksum, modifiedTime)"
+FOLDER_FIELDS = "nextPageToken, files(id)"
+
+# Supabase files columns; records are kept as tuples in this order until upload
+FILE_COLUMNS = (
+    "file_name", "file_path", "file_ext", "mime_type", "file_size_bytes",
+    "file_hash", "file_modified_at", "gdrive_id", "gdrive_parent_id", "status",
+)
+GDRIVE_ID_COLUMN = FILE_COLUMNS.index("gdrive_id")
 
 # Supabase
 SUPABASE_URL = os.getenv("AKASHA_SUPABASE_URL")
@@ -54,58 +85,131 @@ MIME_MAP = {
 }
 
 
+@functools.lru_cache(maxsize=1)
+def _load_credentials(token_path: Path):
+    """Credentials for this process: unpickled (or obtained via browser flow) once"""
+    creds = None
+    if token_path.exists():
+        with open(token_path, 'rb') as f:
+            creds = pickle.load(f)
+
+    if not creds or not (creds.valid or (creds.expired and creds.refresh_token)):
+        flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_PATH), SCOPES)
+        creds = flow.run_local_server(port=0)
+        _store_credentials(token_path, creds)
+
+    return creds
+
+
+def _store_credentials(token_path: Path, creds):
+    """Persist credentials so the next process starts warm"""
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(token_path, 'wb') as f:
+        pickle.dump(creds, f)
+
+
 class DriveScanner:
-    def __init__(self):
-        self.service = self._authenticate()
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        self._progress = ScanProgress("files cataloged")
+        self._creds = self._authenticate()
+        self.service = self._build_service()
+        # googleapiclient/httplib2 are not thread-safe: one service per worker thread
+        self._local = threading.local()
+        self._lock = threading.Lock()
         self.checkpoint = self._load_checkpoint()
+        # In-memory mirror of the checkpoint for O(1) membership without a query per file
+        self._scanned_ids = {row[0] for row in self.checkpoint.execute("SELECT id FROM scanned")}
         self.stats = {"scanned": 0, "new": 0, "duplicates": 0, "errors": 0}
         self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
     def _authenticate(self):
-        """OAuth2 authentication with token caching"""
-        creds = None
-        if TOKEN_PATH.exists():
-            with open(TOKEN_PATH, 'rb') as f:
-                creds = pickle.load(f)
-
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                flow = InstalledAppFlow.from_client_secrets_file(str(CREDENTIALS_PATH), SCOPES)
-                creds = flow.run_local_server(port=0)
-
-            TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with open(TOKEN_PATH, 'wb') as f:
-                pickle.dump(creds, f)
-
-        return build('drive', 'v3', credentials=creds)
-
-    def _load_checkpoint(self) -> Dict:
-        """Load scan checkpoint (never reprocess)"""
-        if CHECKPOINT_PATH.exists():
-            with open(CHECKPOINT_PATH) as f:
-                return json.load(f)
-        return {"scanned_ids": [], "last_scan": None}
+        """OAuth2 authentication with token caching (in-process + pickle on disk)"""
+        creds = _load_credentials(TOKEN_PATH)
+
+        # Refresh only when the token is about to expire, not on every scan
+        if creds.expiry is not None and creds.expiry - datetime.utcnow() <= TOKEN_REFRESH_MARGIN:
+            creds.refresh(Request())
+            _store_credentials(TOKEN_PATH, creds)
+
+        return creds
+
+    def _thread_service(self):
+        """Drive service bound to the current thread"""
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._build_service()
+            self._local.service = service
+        return service
+
+    def _build_service(self):
+        """Drive client over one keep-alive HTTP connection (reused by every list call)"""
+        http = AuthorizedHttp(self._creds, http=httplib2.Http(timeout=60))
+        return build('drive', 'v3', http=http, cache_discovery=False, static_discovery=True)
+
+    def _load_checkpoint(self) -> sqlite3.Connection:
+        """Open scan checkpoint (never reprocess). Append-only SQLite, WAL mode"""
+        CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Shared by the worker threads; every access goes through self._lock
+        conn = sqlite3.connect(str(CHECKPOINT_PATH), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS scanned (id TEXT PRIMARY KEY)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        # One-time import of the old JSON checkpoint
+        if LEGACY_CHECKPOINT_PATH.exists():
+            with open(LEGACY_CHECKPOINT_PATH, 'rb') as f:
+                legacy = orjson.loads(f.read()) if orjson else json.load(f)
+            conn.executemany(
+                "INSERT OR IGNORE INTO scanned (id) VALUES (?)",
+                ((fid,) for fid in legacy.get("scanned_ids", [])),
+            )
+            conn.commit()
+            LEGACY_CHECKPOINT_PATH.rename(LEGACY_CHECKPOINT_PATH.with_suffix('.json.migrated'))
+
+        return conn
+
+    def _is_scanned(self, file_id: str) -> bool:
+        """Checkpoint membership test (caller holds self._lock)"""
+        return file_id in self._scanned_ids
+
+    def _mark_scanned(self, file_id: str):
+        """Claim a file for this run (caller holds self._lock). The checkpoint row is
+        only written once the file is in Supabase (see _checkpoint_rows)"""
+        self._scanned_ids.add(file_id)
+
+    def _checkpoint_rows(self, rows: List[Tuple]):
+        """Persist the ids of file rows that were upserted successfully"""
+        with self._lock:
+            self.checkpoint.executemany(
+                "INSERT OR IGNORE INTO scanned (id) VALUES (?)",
+                ((row[GDRIVE_ID_COLUMN],) for row in rows),
+            )
+            self.checkpoint.commit()
 
     def _save_checkpoint(self):
         """Save scan checkpoint"""
-        CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
-        self.checkpoint["last_scan"] = datetime.now().isoformat()
-        with open(CHECKPOINT_PATH, 'w') as f:
-            json.dump(self.checkpoint, f, indent=2)
+        with self._lock:
+            self.checkpoint.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_scan', ?)",
+                (datetime.now().isoformat(),),
+            )
+            self.checkpoint.commit()
 
     def _classify_mime(self, mime_type: str) -> str:
         """Map MIME type to file_type"""
         return MIME_MAP.get(mime_type, 'other')
 
-    def scan_shared_with_me(self, batch_size: int = 50, recursive: bool = True,
+    def scan_shared_with_me(self, batch_size: int = DRIVE_MAX_PAGE_SIZE, recursive: bool = True,
                            dry_run: bool = False) -> Dict:
         """Scan 'Shared with me' files and folders."""
         print(f"\n📂 Scanning 'Shared with me'")
+        batch_size = min(batch_size, DRIVE_MAX_PAGE_SIZE)
         print(f"   Recursive: {recursive} | Batch: {batch_size} | Dry run: {dry_run}\n")
 
         all_files = []
+        shared_folders = []
         page_token = None
 
         while True:
@@ -116,64 +220,48 @@ class DriveScanner:
                 fields="nextPageToken, files(id, name, mimeType, size, md5Checksum, modifiedTime, parents)",
                 includeItemsFromAllDrives=True,
                 supportsAllDrives=True,
-            ).execute()
+            ).execute(num_retries=DRIVE_RETRIES)
 
             files = response.get('files', [])
 
             for file in files:
                 self.stats["scanned"] += 1
 
-                if file['id'] in self.checkpoint.get("scanned_ids", []):
-                    self.stats["duplicates"] += 1
-                    continue
+                with self._lock:
+                    if self._is_scanned(file['id']):
+                        self.stats["duplicates"] += 1
+                        continue
 
-                # Recurse into shared folders
-                if file['mimeType'] == 'application/vnd.google-apps.folder':
+                # Recurse into shared folders (after listing, in parallel)
+                if file['mimeType'] == FOLDER_MIME:
                     print(f"   📁 Shared folder: {file['name']}")
                     if recursive:
-                        sub_result = self.scan_folder(file['id'], recursive, batch_size, dry_run)
-                        all_files.extend(sub_result.get("files", []))
+                        shared_folders.append(file['id'])
                     continue
 
-                file_type = self._classify_mime(file['mimeType'])
                 name = file['name']
-                ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
-
-                file_record = {
-                    "file_name": name,
-                    "file_path": f"gdrive://{file['id']}/{name}",
-                    "file_ext": ext,
-                    "mime_type": file['mimeType'],
-                    "file_size_bytes": int(file.get('size', 0)),
-                    "file_hash": file.get('md5Checksum'),
-                    "file_modified_at": file.get('modifiedTime'),
-                    "gdrive_id": file['id'],
-                    "gdrive_parent_id": (file.get('parents') or ['shared'])[0],
-                    "status": "cataloged"
-                }
-
-                all_files.append(file_record)
+                all_files.append(self._file_row(file, (file.get('parents') or ['shared'])[0]))
                 self.stats["new"] += 1
-                self.checkpoint.setdefault("scanned_ids", []).append(file['id'])
+                with self._lock:
+                    self._mark_scanned(file['id'])
 
-                size_mb = int(file.get('size', 0)) / 1024 / 1024
-                print(f"   📄 {name} ({file_type}, {size_mb:.1f}MB)")
+                if self.verbose:
+                    file_type = self._classify_mime(file['mimeType'])
+                    size_mb = int(file.get('size', 0)) / 1024 / 1024
+                    print(f"   📄 {name} ({file_type}, {size_mb:.1f}MB)")
+                else:
+                    self._progress.tick()
 
             page_token = response.get('nextPageToken')
             if not page_token:
                 break
 
-        # Batch insert
+        if shared_folders:
+            all_files.extend(self._scan_tree(shared_folders, recursive, batch_size))
+
+        # Batch upsert to Supabase
         if all_files and not dry_run:
-            for i in range(0, len(all_files), 100):
-                batch = all_files[i:i+100]
-                try:
-                    self.supabase.table("files").upsert(
-                        batch, on_conflict="gdrive_id"
-                    ).execute()
-                except Exception as e:
-                    print(f"   ❌ Batch insert error: {e}")
-                    self.stats["errors"] += 1
+            self._upsert_files(all_files)
 
         self._save_checkpoint()
 
@@ -183,118 +271,178 @@ class DriveScanner:
         print(f"   Duplicates: {self.stats['duplicates']}")
         print(f"   Errors: {self.stats['errors']}")
 
-        return {"files": all_files, "stats": self.stats}
+        return {"files": len(all_files), "stats": self.stats}
 
     def scan_folder(self, folder_id: str = "root", recursive: bool = True,
-                    batch_size: int = 50, dry_run: bool = False) -> Dict:
+                    batch_size: int = DRIVE_MAX_PAGE_SIZE, dry_run: bool = False) -> Dict:
         """
         Scan Google Drive folder and catalog to Supabase
         """
         print(f"\n📂 Scanning folder: {folder_id}")
+        batch_size = min(batch_size, DRIVE_MAX_PAGE_SIZE)
         print(f"   Recursive: {recursive} | Batch: {batch_size} | Dry run: {dry_run}\n")
 
+        all_files = self._scan_tree([folder_id], recursive, batch_size)
+
+        # Batch upsert to Supabase
+        if all_files and not dry_run:
+            self._upsert_files(all_files)
+
+        self._save_checkpoint()
+
+        # Summary
+        print(f"\n📊 SCAN SUMMARY")
+        print(f"   Scanned: {self.stats['scanned']}")
+        print(f"   New: {self.stats['new']}")
+        print(f"   Duplicates: {self.stats['duplicates']}")
+        print(f"   Errors: {self.stats['errors']}")
+
+        return {
+            "files": len(all_files),
+            "stats": self.stats
+        }
+
+    @staticmethod
+    def _file_row(file: Dict, parent_id: str) -> Tuple:
+        """Compact file record (values in FILE_COLUMNS order)"""
+        name = file['name']
+        ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+        return (
+            name,
+            f"gdrive://{file['id']}/{name}",
+            ext,
+            file['mimeType'],
+            int(file.get('size', 0)),
+            file.get('md5Checksum'),
+            file.get('modifiedTime'),
+            file['id'],
+            parent_id,
+            "cataloged",
+        )
+
+    def _upsert_files(self, rows: List[Tuple]):
+        """Upsert file rows in adaptive bulk batches"""
+        _, failed = write_batched(self.supabase, "files", rows,
+                                  on_conflict="gdrive_id", columns=FILE_COLUMNS,
+                                  on_written=self._checkpoint_rows)
+        if failed:
+            print(f"   ❌ {failed} records failed to upsert")
+            self.stats["errors"] += failed
+
+    def _scan_tree(self, folder_ids: List[str], recursive: bool, batch_size: int) -> List[Tuple]:
+        """Scan folders through a bounded work queue; subfolders are queued as soon as
+        their parent finishes listing (no per-level barrier)"""
         all_files = []
+        # Drive folders can have several parents, so the tree is not a strict DAG walk
+        visited = set(folder_ids)
+
+        with ThreadPoolExecutor(max_workers=DRIVE_WORKERS) as executor:
+            # future -> folder id, so a failed listing can be reported and skipped
+            folder_of = {
+                executor.submit(self._scan_one_folder, fid, batch_size, recursive): fid
+                for fid in visited
+            }
+            pending = set(folder_of)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder_id = folder_of.pop(future)
+                    try:
+                        files, subfolders = future.result()
+                    except Exception as e:
+                        print(f"   ❌ Failed to list folder {folder_id}: {e}")
+                        self.stats["errors"] += 1
+                        continue
+                    all_files.extend(files)
+                    for sub_id in subfolders:
+                        if sub_id not in visited:
+                            visited.add(sub_id)
+                            sub_future = executor.submit(
+                                self._scan_one_folder, sub_id, batch_size, recursive
+                            )
+                            folder_of[sub_future] = sub_id
+                            pending.add(sub_future)
+
+        return all_files
+
+    def _list_pages(self, service, query: str, fields: str, batch_size: int):
+        """Yield each page of files.list results for a query"""
         page_token = None
-
         while True:
-            query = f"'{folder_id}' in parents and trashed = false"
-
-            response = self.service.files().list(
+            response = service.files().list(
                 q=query,
                 pageSize=batch_size,
                 pageToken=page_token,
-                fields="nextPageToken, files(id, name, mimeType, size, md5Checksum, modifiedTime, parents)",
+                fields=fields,
                 includeItemsFromAllDrives=True,
                 supportsAllDrives=True,
-            ).execute()
+            ).execute(num_retries=DRIVE_RETRIES)
 
-            files = response.get('files', [])
+            yield response.get('files', [])
 
-            for file in files:
-                self.stats["scanned"] += 1
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
 
+    def _scan_one_folder(self, folder_id: str, batch_size: int,
+                         recursive: bool = True) -> Tuple[List[Tuple], List[str]]:
+        """List every page of a single folder. Returns (file rows, subfolder ids)"""
+        service = self._thread_service()
+        records = []
+        subfolders = []
+        in_folder = f"'{folder_id}' in parents and trashed = false"
+
+        # Files only: folders never carry size/md5Checksum, so they get their own query
+        for files in self._list_pages(service, f"{in_folder} and mimeType != '{FOLDER_MIME}'",
+                                      FILE_FIELDS, batch_size):
+            for file in files:
                 # Skip already scanned
-                if file['id'] in self.checkpoint.get("scanned_ids", []):
-                    self.stats["duplicates"] += 1
-                    continue
-
-                # Recurse into folders
-                if file['mimeType'] == 'application/vnd.google-apps.folder':
-                    if recursive:
-                        sub_result = self.scan_folder(file['id'], recursive, batch_size, dry_run)
-                        all_files.extend(sub_result.get("files", []))
-                    continue
+                with self._lock:
+                    self.stats["scanned"] += 1
+                    if self._is_scanned(file['id']):
+                        self.stats["duplicates"] += 1
+                        continue
 
-                file_type = self._classify_mime(file['mimeType'])
-
-                # Extract file extension
                 name = file['name']
-                ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
-
-                file_record = {
-                    "file_name": name,
-                    "file_path": f"gdrive://{file['id']}/{name}",
-                    "file_ext": ext,
-                    "mime_type": file['mimeType'],
-                    "file_size_bytes": int(file.get('size', 0)),
-                    "file_hash": file.get('md5Checksum'),
-                    "file_modified_at": file.get('modifiedTime'),
-                    "gdrive_id": file['id'],
-                    "gdrive_parent_id": folder_id,
-                    "status": "cataloged"
-                }
-
-                all_files.append(file_record)
-                self.stats["new"] += 1
-
-                # Update checkpoint
-                self.checkpoint.setdefault("scanned_ids", []).append(file['id'])
-
-                print(f"   📄 {file['name']} ({file_type}, {int(file.get('size', 0))/1024/1024:.1f}MB)")
+                records.append(self._file_row(file, folder_id))
 
-            page_token = response.get('nextPageToken')
-            if not page_token:
-                break
-
-        # Batch insert to Supabase
-        if all_files and not dry_run:
-            for i in range(0, len(all_files), 100):
-                batch = all_files[i:i+100]
-                try:
-                    self.supabase.table("files").upsert(
-                        batch,
-                        on_conflict="gdrive_id"
-                    ).execute()
-                except Exception as e:
-                    print(f"   ❌ Batch insert error: {e}")
-                    self.stats["errors"] += 1
+                # Claim for this run; checkpointed after the upsert succeeds
+                with self._lock:
+                    self.stats["new"] += 1
+                    self._mark_scanned(file['id'])
 
-        self._save_checkpoint()
+                if self.verbose:
+                    file_type = self._classify_mime(file['mimeType'])
+                    print(f"   📄 {name} ({file_type}, {int(file.get('size', 0))/1024/1024:.1f}MB)")
+                else:
+                    self._progress.tick()
 
-        # Summary
-        print(f"\n📊 SCAN SUMMARY")
-        print(f"   Scanned: {self.stats['scanned']}")
-        print(f"   New: {self.stats['new']}")
-        print(f"   Duplicates: {self.stats['duplicates']}")
-        print(f"   Errors: {self.stats['errors']}")
+        # Subfolders (next level): ids are all the walk needs
+        if recursive:
+            for folders in self._list_pages(service, f"{in_folder} and mimeType = '{FOLDER_MIME}'",
+                                            FOLDER_FIELDS, batch_size):
+                subfolders.extend(folder['id'] for folder in folders)
 
-        return {
-            "files": all_files,
-            "stats": self.stats
-        }
+        return records, subfolders
 
     def show_stats(self):
-        """Show catalog statistics from Supabase"""
+        """Show catalog statistics from Supabase (one grouped query on the v_file_stats
+        view, see akasha-hub/supabase/migrations)"""
+        by_status: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        for row in (self.supabase.table("v_file_stats").select("*").execute().data or []):
+            by_status[row["status"]] = by_status.get(row["status"], 0) + row["n"]
+            ftype = self._classify_mime(row["mime_type"])
+            by_type[ftype] = by_type.get(ftype, 0) + row["n"]
+
         print("\n📊 CATALOG STATS")
         for status in ['cataloged', 'processing', 'extracted', 'error']:
-            count = self.supabase.table("files").select("id", count="exact").eq("status", status).execute()
-            print(f"   {status}: {count.count}")
+            print(f"   {status}: {by_status.get(status, 0)}")
 
         print("\n📁 Por tipo:")
         for ftype in ['pdf', 'video', 'audio', 'text', 'image', 'document', 'other']:
-            count = self.supabase.table("files").select("id", count="exact").eq("mime_type", ftype).execute()
-            if count.count > 0:
-                print(f"   {ftype}: {count.count}")
+            if by_type.get(ftype, 0) > 0:
+                print(f"   {ftype}: {by_type[ftype]}")
 
 
 def main():
@@ -302,15 +450,17 @@ def main():
 
     parser = argparse.ArgumentParser(description="Akasha Drive Scanner")
     parser.add_argument("--folder-id", default="root", help="Google Drive folder ID")
-    parser.add_argument("--batch-size", type=int, default=50, help="Files per request")
+    parser.add_argument("--batch-size", type=int, default=DRIVE_MAX_PAGE_SIZE,
+                        help="Files per request (max 1000)")
     parser.add_argument("--dry-run", action="store_true", help="Preview only")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print every cataloged file")
     parser.add_argument("--stats", action="store_true", help="Show catalog stats")
     parser.add_argument("--no-recursive", action="store_true", help="Don't scan subfolders")
     parser.add_argument("--shared", action="store_true", help="Scan 'Shared with me' files")
 
     args = parser.parse_args()
 
-    scanner = DriveScanner()
+    scanner = DriveScanner(verbose=args.verbose)
 
     if args.stats:
         scanner.show_stats()
@@ -11,11 +11,20 @@ Schema:
 """
 import os
 import json
+import functools
+import sqlite3
 import hashlib
 import mimetypes
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson  # optional: faster parse of large legacy JSON checkpoints
+except ImportError:
+    orjson = None
 
 from dotenv import load_dotenv
 _env_path = Path(__file__).resolve().parents[3] / '.env'
@@ -24,27 +33,49 @@ if _env_path.exists():
 
 from supabase import create_client, Client
 
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from progress import ScanProgress
+from supabase_batch import write_batched
+
 # Supabase
 SUPABASE_URL = os.getenv("AKASHA_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("AKASHA_SUPABASE_KEY")
 
 # Checkpoint
-CHECKPOINT_PATH = Path.home() / '.openclaw/hubs/akasha/checkpoints/scan_local_checkpoint.json'
+CHECKPOINT_PATH = Path.home() / '.openclaw/hubs/akasha/checkpoints/scan_local_checkpoint.db'
+LEGACY_CHECKPOINT_PATH = CHECKPOINT_PATH.with_suffix('.json')
+CHECKPOINT_COMMIT_EVERY = 1000  # records between checkpoint commits
+
+# Supabase files columns; records are kept as tuples in this order until upload
+FILE_COLUMNS = (
+    "source_id", "file_name", "file_path", "file_ext", "mime_type",
+    "file_size_bytes", "file_hash", "file_modified_at", "status",
+)
+FILE_PATH_COLUMN = FILE_COLUMNS.index("file_path")
+
+# Hashing
+MAX_HASH_SIZE = 500_000_000  # skip hash for >500MB
+HASH_WORKERS = min(8, os.cpu_count() or 1)  # bounded to keep SSD queue depth sane
 
 # Skip patterns
-SKIP_DIRS = {
+SKIP_DIRS = frozenset({
     'node_modules', '.git', '.next', '__pycache__', '.cache', '.vscode',
     '.idea', 'dist', 'build', '.npm', '.yarn', '.pnpm-store', '.bun',
     'venv', '.venv', 'env', '.env', '.tox', '.mypy_cache', '.pytest_cache',
     '$RECYCLE.BIN', 'System Volume Information', 'AppData',
-}
+})
 
-SKIP_EXTENSIONS = {
+SKIP_EXTENSIONS = frozenset({
     '.exe', '.dll', '.sys', '.msi', '.cab', '.tmp', '.log',
     '.pyc', '.pyo', '.o', '.obj', '.class', '.jar',
     '.lock', '.map', '.min.js', '.min.css',
     '.lnk', '.url', '.ini', '.dat', '.blf', '.regtrans-ms',
-}
+})
+
+# Name prefixes: hidden/dunder dirs; hidden files and Office temp files (~$)
+SKIP_DIR_PREFIXES = ('.', '__')
+SKIP_FILE_PREFIXES = ('.', '~$')
 
 # Valuable file types to prioritize
 VALUABLE_EXTENSIONS = {
@@ -86,12 +117,27 @@ MIME_OVERRIDES = {
     '.ogg': 'audio/ogg',
 }
 
+# Prebuilt extension -> MIME table (overrides win over the system mime.types).
+# Compression suffixes (.gz, .bz2...) stay out: their type depends on the inner suffix.
+mimetypes.init()
+EXT_TO_MIME = dict(MIME_OVERRIDES)
+for _ext in VALUABLE_EXTENSIONS - MIME_OVERRIDES.keys():
+    _mime, _encoding = mimetypes.guess_type('x' + _ext)
+    if _encoding is None:
+        EXT_TO_MIME[_ext] = _mime or 'application/octet-stream'
 
-def file_hash_md5(filepath: Path, chunk_size: int = 8192) -> str:
+
+def file_hash_md5(filepath: Path, chunk_size: int = 1 << 20) -> str:
     """Calculate MD5 hash of a file."""
     h = hashlib.md5()
     try:
         with open(filepath, 'rb') as f:
+            # Whole-file sequential read: let the kernel read ahead aggressively
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            # Python 3.11+: C loop with large reads, GIL released while hashing
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, 'md5').hexdigest()
             while True:
                 chunk = f.read(chunk_size)
                 if not chunk:
@@ -102,63 +148,96 @@ def file_hash_md5(filepath: Path, chunk_size: int = 8192) -> str:
         return None
 
 
+@functools.lru_cache(maxsize=1024)
+def _classify_ext(ext: str) -> Tuple[bool, bool, Optional[str]]:
+    """(skip, valuable, mime) for a lowercased suffix; mime None = guess from the name."""
+    return ext in SKIP_EXTENSIONS, ext in VALUABLE_EXTENSIONS, EXT_TO_MIME.get(ext)
+
+
 def get_mime_type(filepath: Path) -> str:
     """Get MIME type with overrides for common types."""
-    ext = filepath.suffix.lower()
-    if ext in MIME_OVERRIDES:
-        return MIME_OVERRIDES[ext]
-    mime, _ = mimetypes.guess_type(str(filepath))
-    return mime or 'application/octet-stream'
+    mime = _classify_ext(filepath.suffix.lower())[2]
+    if mime is None:
+        mime = mimetypes.guess_type(str(filepath))[0] or 'application/octet-stream'
+    return mime
 
 
 class LocalScanner:
-    def __init__(self):
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        self._progress = ScanProgress("files cataloged")
         self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
         self.checkpoint = self._load_checkpoint()
         self.stats = {
-            "scanned": 0, "new": 0, "skipped": 0,
+            "scanned": 0, "new": 0, "modified": 0, "skipped": 0,
             "duplicates": 0, "errors": 0
         }
 
-    def _load_checkpoint(self) -> Dict:
-        if CHECKPOINT_PATH.exists():
-            with open(CHECKPOINT_PATH) as f:
-                return json.load(f)
-        return {"scanned_paths": {}, "last_scan": None}
+    def _load_checkpoint(self) -> sqlite3.Connection:
+        """Open the append-only SQLite checkpoint (one row per cataloged path)."""
+        CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(CHECKPOINT_PATH))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""CREATE TABLE IF NOT EXISTS scanned_paths (
+            path TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime REAL,
+            hash TEXT,
+            scanned_at TEXT
+        )""")
+        conn.execute("CREATE INDEX IF NOT EXISTS scanned_paths_size ON scanned_paths (size)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        # One-time import of the old JSON checkpoint
+        if LEGACY_CHECKPOINT_PATH.exists():
+            with open(LEGACY_CHECKPOINT_PATH, 'rb') as f:
+                legacy = orjson.loads(f.read()) if orjson else json.load(f)
+            conn.executemany(
+                "INSERT OR IGNORE INTO scanned_paths VALUES (?, ?, ?, ?, ?)",
+                (
+                    (path, rec.get("size"), rec.get("mtime"), rec.get("hash"), rec.get("scanned_at"))
+                    for path, rec in legacy.get("scanned_paths", {}).items()
+                ),
+            )
+            conn.commit()
+            LEGACY_CHECKPOINT_PATH.rename(LEGACY_CHECKPOINT_PATH.with_suffix('.json.migrated'))
+
+        return conn
+
+    def _lookup_path(self, str_path: str) -> Optional[Tuple]:
+        """(size, mtime) recorded for a path, or None if never cataloged."""
+        return self.checkpoint.execute(
+            "SELECT size, mtime FROM scanned_paths WHERE path = ?", (str_path,)
+        ).fetchone()
+
+    def _paths_with_size(self, size: int, exclude: str) -> List[Tuple]:
+        """(path, hash) of other cataloged paths with exactly this size."""
+        return self.checkpoint.execute(
+            "SELECT path, hash FROM scanned_paths WHERE size = ? AND path != ?",
+            (size, exclude),
+        ).fetchall()
+
+    def _record_path(self, str_path: str, size: int, mtime: float, fhash: Optional[str]):
+        """Append/replace a path in the checkpoint (committed in batches)."""
+        self.checkpoint.execute(
+            "INSERT OR REPLACE INTO scanned_paths VALUES (?, ?, ?, ?, ?)",
+            (str_path, size, mtime, fhash, datetime.now().isoformat()),
+        )
+
+    def _record_written(self, rows: List[Tuple], tracked: Dict[str, Tuple]):
+        """Checkpoint a batch of rows Supabase accepted and commit it.
+        tracked maps each row's file_path to its (path, size, mtime, hash)."""
+        for row in rows:
+            self._record_path(*tracked[row[FILE_PATH_COLUMN]])
+        self.checkpoint.commit()
 
     def _save_checkpoint(self):
-        CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
-        self.checkpoint["last_scan"] = datetime.now().isoformat()
-        # Keep checkpoint manageable
-        with open(CHECKPOINT_PATH, 'w') as f:
-            json.dump(self.checkpoint, f, indent=2)
-
-    def _should_skip_dir(self, dirpath: Path) -> bool:
-        """Check if directory should be skipped."""
-        name = dirpath.name
-        if name.startswith('.'):
-            return True
-        if name in SKIP_DIRS:
-            return True
-        if name.startswith('__'):
-            return True
-        return False
-
-    def _should_skip_file(self, filepath: Path) -> bool:
-        """Check if file should be skipped."""
-        ext = filepath.suffix.lower()
-        if ext in SKIP_EXTENSIONS:
-            return True
-        if filepath.name.startswith('~$'):  # Office temp files
-            return True
-        if filepath.name.startswith('.'):
-            return True
-        return False
-
-    def _is_valuable(self, filepath: Path) -> bool:
-        """Check if file extension is valuable."""
-        ext = filepath.suffix.lower()
-        return ext in VALUABLE_EXTENSIONS
+        self.checkpoint.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_scan', ?)",
+            (datetime.now().isoformat(),),
+        )
+        self.checkpoint.commit()
 
     def scan_directory(self, base_path: str, recursive: bool = True,
                        valuable_only: bool = True, dry_run: bool = False,
@@ -176,110 +255,197 @@ class LocalScanner:
         source_id = self._get_or_create_source(str(base))
 
         files_to_insert = []
+        files_to_update = []
+        # file_path -> checkpoint entry, recorded only once the row is written
+        tracked: Dict[str, Tuple] = {}
 
+        # (path, os.DirEntry | None): the DirEntry carries the cached stat
         if base.is_file():
-            files_iter = [base]
-        elif recursive:
-            files_iter = self._walk_files(base, valuable_only)
+            files_iter = [(base, None)]
         else:
-            files_iter = [f for f in base.iterdir() if f.is_file()]
+            files_iter = self._walk_files(base, valuable_only, recursive)
 
-        for filepath in files_iter:
-            if max_files and self.stats["new"] >= max_files:
+        # Pass 1: walk + filter (cheap, single-threaded)
+        pending = []  # (filepath, stat, modified)
+        for filepath, entry in files_iter:
+            if max_files and len(pending) >= max_files:
                 print(f"\n  Max files reached ({max_files})")
                 break
 
             self.stats["scanned"] += 1
 
-            if self._should_skip_file(filepath):
+            # One cached lookup answers skip/valuable for the file's extension
+            skip, valuable, _ = _classify_ext(filepath.suffix.lower())
+            if skip or filepath.name.startswith(SKIP_FILE_PREFIXES):
                 self.stats["skipped"] += 1
                 continue
 
-            if valuable_only and not self._is_valuable(filepath):
+            if valuable_only and not valuable:
                 self.stats["skipped"] += 1
                 continue
 
-            # Check if already scanned (by path)
-            str_path = str(filepath)
-            if str_path in self.checkpoint.get("scanned_paths", {}):
-                self.stats["duplicates"] += 1
+            try:
+                stat = entry.stat() if entry is not None else filepath.stat()
+            except (PermissionError, OSError):
+                self.stats["errors"] += 1
                 continue
 
-            try:
-                stat = filepath.stat()
+            # Check if already scanned (by path): unchanged size+mtime means the
+            # stored record and hash are still valid, so the file is never read
+            cached = self._lookup_path(str(filepath))
+            if cached is not None:
+                size, mtime = cached
+                if mtime is None or (size == stat.st_size and mtime == stat.st_mtime):
+                    self.stats["duplicates"] += 1
+                    continue
+
+            pending.append((filepath, stat, cached is not None))
+
+        # Size-first dedup: only files whose size is shared with another file in
+        # this scan or with a cataloged path can be duplicates, so only those are
+        # hashed. Cataloged peers stored without a hash get one now (backfill).
+        size_counts = Counter(stat.st_size for _, stat, _ in pending)
+        pending_paths = {str(filepath) for filepath, _, _ in pending}
+        candidates = []  # (filepath, stat, modified, hash_it)
+        backfill = set()
+        for filepath, stat, modified in pending:
+            hash_it = False
+            if stat.st_size < MAX_HASH_SIZE:
+                peers = self._paths_with_size(stat.st_size, str(filepath))
+                backfill.update(path for path, fhash in peers
+                                if fhash is None and path not in pending_paths)
+                hash_it = size_counts[stat.st_size] > 1 or bool(peers)
+            candidates.append((filepath, stat, modified, hash_it))
+
+        # Pass 2: hash in parallel (hashlib releases the GIL); map keeps the order
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            hashes = executor.map(self._hash_candidate, candidates)
+            backfill_hashes = executor.map(file_hash_md5, sorted(backfill))
+
+            for (filepath, stat, modified, _), fhash in zip(candidates, hashes):
+                str_path = str(filepath)
                 mime_type = get_mime_type(filepath)
                 ext = filepath.suffix.lower().lstrip('.')
-                fhash = file_hash_md5(filepath) if stat.st_size < 500_000_000 else None  # skip hash for >500MB
-
-                file_record = {
-                    "source_id": source_id,
-                    "file_name": filepath.name,
-                    "file_path": f"local://{str_path}",
-                    "file_ext": ext,
-                    "mime_type": mime_type,
-                    "file_size_bytes": stat.st_size,
-                    "file_hash": fhash,
-                    "file_modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "status": "cataloged",
-                }
-
-                files_to_insert.append(file_record)
-                self.stats["new"] += 1
-
-                # Track in checkpoint
-                self.checkpoint.setdefault("scanned_paths", {})[str_path] = {
-                    "size": stat.st_size,
-                    "scanned_at": datetime.now().isoformat()
-                }
-
-                size_mb = stat.st_size / (1024 * 1024)
-                print(f"  {filepath.name} ({mime_type}, {size_mb:.1f}MB)")
-
-            except (PermissionError, OSError) as e:
-                self.stats["errors"] += 1
+
+                file_path = f"local://{str_path}"
+                row = (
+                    source_id,
+                    filepath.name,
+                    file_path,
+                    ext,
+                    mime_type,
+                    stat.st_size,
+                    fhash,
+                    datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    "cataloged",
+                )
+
+                if modified:
+                    files_to_update.append(row)
+                    self.stats["modified"] += 1
+                else:
+                    files_to_insert.append(row)
+                    self.stats["new"] += 1
+
+                # Checkpointed after the insert/update succeeds
+                tracked[file_path] = (str_path, stat.st_size, stat.st_mtime, fhash)
+
+                if self.verbose:
+                    size_mb = stat.st_size / (1024 * 1024)
+                    print(f"  {filepath.name} ({mime_type}, {size_mb:.1f}MB)")
+                else:
+                    self._progress.tick()
+
+        # Cataloged files that now share a size with something: store their hash
+        backfilled = 0
+        for str_path, fhash in zip(sorted(backfill), backfill_hashes):
+            if fhash is None:
+                continue
+            if not dry_run:
+                try:
+                    self.supabase.table("files").update({"file_hash": fhash}).eq(
+                        "file_path", f"local://{str_path}"
+                    ).execute()
+                except Exception:
+                    self.stats["errors"] += 1
+                    continue
+                self.checkpoint.execute(
+                    "UPDATE scanned_paths SET hash = ? WHERE path = ?", (fhash, str_path)
+                )
+            backfilled += 1
+
+        if backfilled:
+            print(f"  Hashes backfilled: {backfilled}")
 
         # Batch insert
         if files_to_insert and not dry_run:
-            inserted = 0
-            for i in range(0, len(files_to_insert), 50):
-                batch = files_to_insert[i:i + 50]
-                try:
-                    self.supabase.table("files").insert(batch).execute()
-                    inserted += len(batch)
-                except Exception as e:
-                    print(f"  Batch insert error: {e}")
-                    # Try one by one
-                    for record in batch:
-                        try:
-                            self.supabase.table("files").insert(record).execute()
-                            inserted += 1
-                        except Exception as e2:
-                            self.stats["errors"] += 1
+            # Halve down to single rows so one bad record does not sink its batch
+            inserted, failed = write_batched(
+                self.supabase, "files", files_to_insert, min_batch=1, columns=FILE_COLUMNS,
+                on_written=lambda rows: self._record_written(rows, tracked),
+            )
+            self.stats["errors"] += failed
 
             print(f"  Inserted: {inserted}")
 
+        # Files changed since the last scan: refresh their existing rows
+        if files_to_update and not dry_run:
+            updated = 0
+            for row in files_to_update:
+                record = dict(zip(FILE_COLUMNS, row))
+                try:
+                    self.supabase.table("files").update(record).eq(
+                        "file_path", record["file_path"]
+                    ).execute()
+                except Exception:
+                    self.stats["errors"] += 1
+                    continue
+                self._record_path(*tracked[record["file_path"]])
+                updated += 1
+                if updated % CHECKPOINT_COMMIT_EVERY == 0:
+                    self.checkpoint.commit()
+
+            print(f"  Updated: {updated}")
+
         self._save_checkpoint()
 
         print(f"\nSCAN SUMMARY")
         print(f"  Scanned: {self.stats['scanned']}")
         print(f"  New: {self.stats['new']}")
+        print(f"  Modified: {self.stats['modified']}")
         print(f"  Skipped: {self.stats['skipped']}")
         print(f"  Duplicates: {self.stats['duplicates']}")
         print(f"  Errors: {self.stats['errors']}")
 
-        return {"stats": self.stats, "files": len(files_to_insert)}
+        return {"stats": self.stats, "files": len(files_to_insert), "updated": len(files_to_update)}
 
-    def _walk_files(self, base: Path, valuable_only: bool):
-        """Walk directory tree yielding files, skipping junk dirs."""
-        try:
-            for entry in sorted(base.iterdir()):
-                if entry.is_dir():
-                    if not self._should_skip_dir(entry):
-                        yield from self._walk_files(entry, valuable_only)
-                elif entry.is_file():
-                    yield entry
-        except (PermissionError, OSError):
-            pass
+    @staticmethod
+    def _hash_candidate(candidate) -> Optional[str]:
+        """Hash worker: MD5 for candidates flagged by the size pre-pass, None otherwise."""
+        filepath, hash_it = candidate[0], candidate[3]
+        return file_hash_md5(filepath) if hash_it else None
+
+    def _walk_files(self, base: Path, valuable_only: bool, recursive: bool = True):
+        """Walk directory tree yielding (path, DirEntry), skipping junk dirs.
+
+        os.scandir answers is_dir/is_file from the directory listing and caches
+        entry.stat(), so each file costs at most one stat syscall. Subdirectories
+        go on an explicit stack, so deep trees never hit the recursion limit.
+        """
+        stack = [str(base)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Skip junk dirs (inlined: runs once per directory entry)
+                            name = entry.name
+                            if recursive and not (name.startswith(SKIP_DIR_PREFIXES) or name in SKIP_DIRS):
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            yield Path(entry.path), entry
+            except (PermissionError, OSError):
+                pass
 
     def _get_or_create_source(self, base_path: str) -> int:
         """Get or create a source record."""
@@ -326,11 +492,12 @@ def main():
     parser.add_argument("--no-recursive", action="store_true", help="Don't scan subfolders")
     parser.add_argument("--all-files", action="store_true", help="Include all files, not just valuable ones")
     parser.add_argument("--dry-run", action="store_true", help="Preview only")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print every cataloged file")
     parser.add_argument("--max-files", type=int, default=0, help="Max files to catalog (0=unlimited)")
 
     args = parser.parse_args()
 
-    scanner = LocalScanner()
+    scanner = LocalScanner(verbose=args.verbose)
     scanner.scan_directory(
         args.path,
         recursive=not args.no_recursive,
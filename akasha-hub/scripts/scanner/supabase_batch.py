@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Akasha Scanner - Supabase bulk writes
+Writes records in large batches (one PostgREST round-trip per batch), halving
+the batch on failure and growing it back after each success.
+"""
+from typing import Callable, List, Optional, Sequence, Tuple
+
+BULK_BATCH_SIZE = 500  # rows per request (PostgREST handles this in one statement)
+MIN_BATCH_SIZE = 25
+
+
+def write_batched(client, table: str, records: List, on_conflict: Optional[str] = None,
+                  batch_size: int = BULK_BATCH_SIZE, min_batch: int = MIN_BATCH_SIZE,
+                  columns: Optional[Sequence[str]] = None,
+                  on_written: Optional[Callable[[List], None]] = None) -> Tuple[int, int]:
+    """
+    Insert (or upsert, when on_conflict is given) records in batches.
+    With columns, records are value tuples and only the batch in flight is
+    expanded into dicts. on_written is called with the original records of
+    each batch the server accepted (e.g. to checkpoint them).
+    Returns (written, failed) record counts.
+    """
+    written = failed = 0
+    size = batch_size
+    i = 0
+
+    while i < len(records):
+        rows = batch = records[i:i + size]
+        if columns is not None:
+            batch = [dict(zip(columns, row)) for row in rows]
+        try:
+            query = client.table(table)
+            if on_conflict:
+                query.upsert(batch, on_conflict=on_conflict).execute()
+            else:
+                query.insert(batch).execute()
+        except Exception as e:
+            if size > min_batch:
+                # Oversized payload or a bad row: retry the same offset with half the batch
+                size = max(min_batch, size // 2)
+                continue
+            print(f"   Batch write error ({len(batch)} rows): {e}")
+            failed += len(batch)
+            i += len(batch)
+            continue
+
+        written += len(batch)
+        i += len(batch)
+        if on_written is not None:
+            on_written(rows)
+        size = min(batch_size, size * 2)
+
+    return written, failed
@@ -0,0 +1,15 @@
+-- Migration: Akasha catalog stats
+-- Data: 2026-10-16
+-- Descrição: Contagens agregadas (GROUP BY) da tabela files do Akasha Hub,
+-- usadas por DriveScanner.show_stats em uma unica consulta.
+-- Aplicar no projeto Supabase do Akasha (AKASHA_SUPABASE_URL).
+
+-- =======================
+-- VIEWS DE ESTATÍSTICA
+-- =======================
+
+-- View: Quantidade de arquivos por (status, mime_type)
+CREATE OR REPLACE VIEW v_file_stats AS
+SELECT status, mime_type, COUNT(*) AS n
+FROM files
+GROUP BY status, mime_type;
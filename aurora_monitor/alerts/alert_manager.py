@@ -8,38 +8,91 @@ Gerencia envio de alertas para múltiplos canais:
 - Log
 """
 
+import base64
+import hashlib
+import heapq
+import http.client
 import json
+import queue
+import sys
 import threading
 import time
-from collections import deque
+import urllib.request
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Callable, Dict, List, Optional, Any
-import urllib.request
-import urllib.error
+from itertools import islice, takewhile
+from typing import Callable, Deque, Dict, List, Optional, Any, Tuple
+from urllib.parse import SplitResult, unquote, urlsplit
 
 from aurora_monitor.core.config import AlertConfig
 
+# Tenta importar orjson (opcional: serialização JSON mais rápida)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# __slots__ nos dataclasses de alerta (Python 3.10+): menos memória nos 10k do histórico
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serializa para JSON UTF-8 (orjson se disponível)."""
+    if ORJSON_AVAILABLE:
+        # metadata é do chamador: chaves não-str viram str, como no json da stdlib
+        data: bytes = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return data
+    return json.dumps(obj).encode('utf-8')
+
 
 class AlertLevel(Enum):
     """Níveis de alerta."""
-    DEBUG = "debug"
-    INFO = "info"
-    WARNING = "warning"
-    ERROR = "error"
-    CRITICAL = "critical"
+    DEBUG = ("debug", 0)
+    INFO = ("info", 1)
+    WARNING = ("warning", 2)
+    ERROR = ("error", 3)
+    CRITICAL = ("critical", 4)
+
+    rank: int
 
-    def __lt__(self, other):
-        order = [AlertLevel.DEBUG, AlertLevel.INFO, AlertLevel.WARNING,
-                 AlertLevel.ERROR, AlertLevel.CRITICAL]
-        return order.index(self) < order.index(other)
+    def __new__(cls, value: str, rank: int) -> "AlertLevel":
+        obj = object.__new__(cls)
+        obj._value_ = value
+        obj.rank = rank
+        return obj
 
-    def __le__(self, other):
-        return self == other or self < other
+    def __lt__(self, other: "AlertLevel") -> bool:
+        return self.rank < other.rank
 
+    def __le__(self, other: "AlertLevel") -> bool:
+        return self.rank <= other.rank
 
-@dataclass
+    def __gt__(self, other: "AlertLevel") -> bool:
+        return self.rank > other.rank
+
+    def __ge__(self, other: "AlertLevel") -> bool:
+        return self.rank >= other.rank
+
+
+# Rótulo em maiúsculas por nível ("[ERROR] ...")
+_LEVEL_LABELS = {lvl: lvl.value.upper() for lvl in AlertLevel}
+
+# Cores dos attachments do Slack por nível
+_SLACK_COLORS = {
+    AlertLevel.DEBUG: "#808080",
+    AlertLevel.INFO: "#36a64f",
+    AlertLevel.WARNING: "#ffcc00",
+    AlertLevel.ERROR: "#ff6600",
+    AlertLevel.CRITICAL: "#ff0000",
+}
+
+
+@dataclass(**_SLOTS)
 class Alert:
     """Representa um alerta."""
     level: AlertLevel
@@ -57,9 +110,8 @@ class Alert:
 
     def __post_init__(self):
         if not self.alert_id:
-            import hashlib
-            content = f"{self.level.value}:{self.title}:{self.source}:{self.timestamp.isoformat()}"
-            self.alert_id = hashlib.md5(content.encode()).hexdigest()[:12]
+            content = f"{self.level.value}:{self.title}:{self.source}:{self.timestamp.timestamp():.6f}"
+            self.alert_id = hashlib.blake2b(content.encode(), digest_size=6).hexdigest()
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário."""
@@ -77,17 +129,18 @@ class Alert:
         }
 
     def __str__(self) -> str:
-        return f"[{self.level.value.upper()}] {self.title}: {self.message}"
+        return f"[{_LEVEL_LABELS[self.level]}] {self.title}: {self.message}"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AlertAggregate:
     """Agregação de alertas similares."""
     key: str
     first_occurrence: datetime
     last_occurrence: datetime
     count: int
-    alerts: List[Alert] = field(default_factory=list)
+    # Últimos 10 alertas da agregação (ring buffer)
+    alerts: Deque[Alert] = field(default_factory=lambda: deque(maxlen=10))
 
 
 class AlertManager:
@@ -115,6 +168,16 @@ class AlertManager:
         manager.on_alert(lambda alert: print(alert))
     """
 
+    # Máximo de alertas agrupados em um único POST para Slack/webhook
+    SEND_BATCH_SIZE = 32
+
+    # A cada N envios, descarta de _last_sent as chaves com cooldown já expirado
+    COOLDOWN_PRUNE_EVERY = 1024
+
+    # Envio paralelo por canal e backoff exponencial após falhas consecutivas
+    CHANNEL_TIMEOUT = 15.0
+    CHANNEL_MAX_BACKOFF = 300.0
+
     def __init__(self, config: Optional[AlertConfig] = None):
         """
         Inicializa o gerenciador de alertas.
@@ -124,26 +187,51 @@ class AlertManager:
         """
         self.config = config or AlertConfig()
 
-        self._lock = threading.Lock()
+        # Locks separados: send() em cooldown não disputa com leitores do histórico.
+        # Ordem de aquisição quando mais de um é necessário: history -> cooldown -> aggregates
+        self._history_lock = threading.Lock()
+        self._cooldown_lock = threading.Lock()
+        self._aggregates_lock = threading.Lock()
+        # Ordem de inserção => ordenado por timestamp (filtros por data param cedo)
         self._history: deque = deque(maxlen=10000)
-        self._last_sent: Dict[str, datetime] = {}
+        # Mesmos alertas de _history particionados por nível (mesma ordem e evicção)
+        self._history_by_level: Dict[AlertLevel, deque] = {lvl: deque() for lvl in AlertLevel}
+        # Contadores mantidos a cada inserção/evicção. Não reconhecidos são contados
+        # em get_stats: Alert.acknowledged é público e pode mudar fora do manager
+        self._source_counts: Counter = Counter()
+        self._last_sent: Dict[str, float] = {}  # chave -> time.monotonic() do último envio
+        self._sends_since_prune = 0
         self._aggregates: Dict[str, AlertAggregate] = {}
 
-        # Callbacks
-        self._on_alert_callbacks: List[Callable[[Alert], None]] = []
+        # Callbacks: tupla imutável trocada a cada registro (copy-on-write),
+        # então _notify_callbacks itera sem lock
+        self._on_alert_callbacks: Tuple[Callable[[Alert], None], ...] = ()
+        self._callbacks_lock = threading.Lock()
 
         # Fila de envio assíncrono
-        self._send_queue: deque = deque()
+        self._send_queue: queue.SimpleQueue = queue.SimpleQueue()
         self._sender_thread: Optional[threading.Thread] = None
         self._sender_running = False
+        self._channel_pool: Optional[ThreadPoolExecutor] = None
+        self._channel_failures: Dict[str, int] = {}
+        self._channel_retry_at: Dict[str, float] = {}  # canal -> time.monotonic()
+        # Envio ainda em andamento por canal (estourou CHANNEL_TIMEOUT e segura um worker)
+        self._channel_inflight: Dict[str, Future] = {}
+
+        # Conexões HTTP keep-alive por (thread, scheme, host, port)
+        self._http_conns: Dict[Tuple[int, str, str, Optional[int]], http.client.HTTPConnection] = {}
 
         # Inicia sender se algum canal externo está habilitado
-        if any([self.config.email_enabled, self.config.slack_enabled, self.config.webhook_enabled]):
+        self._has_external_channel = bool(
+            self.config.email_enabled or self.config.slack_enabled or self.config.webhook_enabled
+        )
+        if self._has_external_channel:
             self._start_sender()
 
     def _start_sender(self) -> None:
         """Inicia thread de envio assíncrono."""
         self._sender_running = True
+        self._channel_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="aurora-ch")
         self._sender_thread = threading.Thread(
             target=self._sender_loop,
             name="aurora-alert-sender",
@@ -152,14 +240,27 @@ class AlertManager:
         self._sender_thread.start()
 
     def _sender_loop(self) -> None:
-        """Loop de envio de alertas."""
-        while self._sender_running:
+        """Loop de envio de alertas (bloqueia na fila; None sinaliza parada)."""
+        running = True
+        while running:
+            alert = self._send_queue.get()
+            if alert is None:
+                break
+
+            # Drena o que já estiver na fila para enviar em lote
+            batch = [alert]
+            while len(batch) < self.SEND_BATCH_SIZE:
+                try:
+                    alert = self._send_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if alert is None:
+                    running = False
+                    break
+                batch.append(alert)
+
             try:
-                if self._send_queue:
-                    alert = self._send_queue.popleft()
-                    self._send_to_channels(alert)
-                else:
-                    time.sleep(0.1)
+                self._send_to_channels(batch)
             except Exception:
                 time.sleep(1)
 
@@ -189,133 +290,285 @@ class AlertManager:
         if not self.config.enabled:
             return None
 
+        now = datetime.now()
+        mono_now = time.monotonic()
+
+        # Verifica cooldown antes de montar o Alert: suprimido sem agregação não aloca nada
+        key = self._get_alert_key(level, source, title)
+        should_send = self._should_send(key, mono_now)
+        if not should_send and not self.config.aggregate_alerts:
+            return None
+
         alert = Alert(
             level=level,
             title=title,
             message=message,
             source=source,
+            timestamp=now,
             tags=tags or {},
             metadata=metadata or {},
         )
 
-        # Verifica cooldown
-        key = self._get_alert_key(alert)
-        if not self._should_send(key):
+        if not should_send:
             self._aggregate(key, alert)
             return None
 
-        with self._lock:
+        with self._history_lock:
+            if len(self._history) == self._history.maxlen:
+                self._forget_oldest()
             self._history.append(alert)
-            self._last_sent[key] = datetime.now()
+            self._history_by_level[level].append(alert)
+            self._source_counts[source.partition('.')[0]] += 1
+        with self._cooldown_lock:
+            self._last_sent[key] = mono_now
+            self._sends_since_prune += 1
+            if self._sends_since_prune >= self.COOLDOWN_PRUNE_EVERY:
+                self._prune_last_sent(mono_now)
 
         # Notifica callbacks
         self._notify_callbacks(alert)
 
         # Adiciona à fila de envio
-        if any([self.config.email_enabled, self.config.slack_enabled, self.config.webhook_enabled]):
-            self._send_queue.append(alert)
+        if self._has_external_channel:
+            self._send_queue.put(alert)
 
         return alert
 
-    def _get_alert_key(self, alert: Alert) -> str:
+    @staticmethod
+    def _get_alert_key(level: AlertLevel, source: str, title: str) -> str:
         """Gera chave única para agregação."""
-        return f"{alert.level.value}:{alert.source}:{alert.title}"
+        return f"{level.value}:{source}:{title}"
 
-    def _should_send(self, key: str) -> bool:
-        """Verifica se deve enviar (cooldown)."""
-        with self._lock:
+    def _should_send(self, key: str, now: float) -> bool:
+        """Verifica se deve enviar (cooldown, em segundos de time.monotonic())."""
+        with self._cooldown_lock:
             last = self._last_sent.get(key)
-            if last is None:
-                return True
-            elapsed = (datetime.now() - last).total_seconds()
-            return elapsed >= self.config.alert_cooldown
+            return last is None or (now - last) >= self.config.alert_cooldown
+
+    def _forget_oldest(self) -> None:
+        """Desconta o alerta que o deque cheio vai descartar (chamar com _history_lock)."""
+        oldest = self._history[0]
+        # O mais antigo do histórico é também o mais antigo do seu nível
+        self._history_by_level[oldest.level].popleft()
+        prefix = oldest.source.partition('.')[0]
+        self._source_counts[prefix] -= 1
+        if not self._source_counts[prefix]:
+            del self._source_counts[prefix]
+
+    def _prune_last_sent(self, now: float) -> None:
+        """Remove chaves cujo cooldown expirou (chamar com _cooldown_lock)."""
+        cooldown = self.config.alert_cooldown
+        self._last_sent = {k: t for k, t in self._last_sent.items() if now - t < cooldown}
+        self._sends_since_prune = 0
 
     def _aggregate(self, key: str, alert: Alert) -> None:
         """Agrega alerta similar."""
         if not self.config.aggregate_alerts:
             return
 
-        with self._lock:
-            if key not in self._aggregates:
-                self._aggregates[key] = AlertAggregate(
+        with self._aggregates_lock:
+            agg = self._aggregates.get(key)
+            if agg is None:
+                agg = self._aggregates[key] = AlertAggregate(
                     key=key,
                     first_occurrence=alert.timestamp,
                     last_occurrence=alert.timestamp,
-                    count=1,
-                    alerts=[alert],
+                    count=0,
                 )
-            else:
-                agg = self._aggregates[key]
-                agg.last_occurrence = alert.timestamp
-                agg.count += 1
-                if len(agg.alerts) < 10:
-                    agg.alerts.append(alert)
-
-    def _send_to_channels(self, alert: Alert) -> None:
-        """Envia alerta para canais configurados."""
-        if self.config.slack_enabled and self.config.slack_webhook_url:
-            self._send_to_slack(alert)
+            agg.alerts.append(alert)
+            agg.last_occurrence = alert.timestamp
+            agg.count += 1
 
-        if self.config.webhook_enabled and self.config.custom_webhook_url:
-            self._send_to_webhook(alert)
+    def _send_to_channels(self, alerts: List[Alert]) -> None:
+        """
+        Envia lote de alertas para canais configurados.
 
+        Cada canal roda em paralelo no pool, então um endpoint lento não segura
+        os demais. Canal em backoff (falhas consecutivas) ou cujo envio anterior
+        ainda não terminou é pulado neste lote, então um endpoint travado ocupa
+        no máximo um worker. Sem pool (antes do sender ou após stop()), os canais
+        rodam em sequência.
+        """
+        channels = []
+        if self.config.slack_enabled and self.config.slack_webhook_url:
+            channels.append(("slack", self._send_to_slack))
+        if self.config.webhook_enabled and self.config.custom_webhook_url:
+            channels.append(("webhook", self._send_to_webhook))
         if self.config.email_enabled and self.config.email_recipients:
-            self._send_email(alert)
+            channels.append(("email", self._send_emails))
+
+        now = time.monotonic()
+        pool = self._channel_pool
+        futures: Dict[Future, str] = {}
+        results: Dict[str, bool] = {}
+        for name, send in channels:
+            if self._channel_retry_at.get(name, 0.0) > now:
+                continue
+            inflight = self._channel_inflight.get(name)
+            if inflight is not None:
+                if not inflight.done():
+                    continue
+                del self._channel_inflight[name]
+            if pool is not None:
+                try:
+                    future = pool.submit(send, alerts)
+                    futures[future] = name
+                    self._channel_inflight[name] = future
+                    continue
+                except RuntimeError:
+                    pool = None  # encerrado por stop() durante o envio
+            results[name] = send(alerts) is True
+
+        if futures:
+            done, _ = wait(futures, timeout=self.CHANNEL_TIMEOUT)
+            for future, name in futures.items():
+                if future in done:
+                    del self._channel_inflight[name]
+                    results[name] = future.result() is True
+                else:
+                    results[name] = False
+
+        now = time.monotonic()
+        for name, ok in results.items():
+            if ok:
+                self._channel_failures.pop(name, None)
+                self._channel_retry_at.pop(name, None)
+            else:
+                failures = self._channel_failures.get(name, 0) + 1
+                self._channel_failures[name] = failures
+                self._channel_retry_at[name] = now + min(2 ** failures, self.CHANNEL_MAX_BACKOFF)
 
-    def _send_to_slack(self, alert: Alert) -> bool:
-        """Envia alerta para Slack."""
+    def _send_emails(self, alerts: List[Alert]) -> bool:
+        """Envia um email por alerta do lote."""
+        results = [self._send_email(alert) for alert in alerts]
+        return all(results)
+
+    def _send_to_slack(self, alerts: List[Alert]) -> bool:
+        """Envia lote de alertas para Slack (um attachment por alerta)."""
         try:
-            color_map = {
-                AlertLevel.DEBUG: "#808080",
-                AlertLevel.INFO: "#36a64f",
-                AlertLevel.WARNING: "#ffcc00",
-                AlertLevel.ERROR: "#ff6600",
-                AlertLevel.CRITICAL: "#ff0000",
-            }
-
-            payload = {
-                "attachments": [{
-                    "color": color_map.get(alert.level, "#808080"),
-                    "title": f"[{alert.level.value.upper()}] {alert.title}",
+            attachments = []
+            for alert in alerts:
+                level = alert.level
+                attachments.append({
+                    "color": _SLACK_COLORS[level],
+                    "title": f"[{_LEVEL_LABELS[level]}] {alert.title}",
                     "text": alert.message,
                     "fields": [
                         {"title": "Source", "value": alert.source, "short": True},
                         {"title": "Time", "value": alert.timestamp.isoformat(), "short": True},
                     ],
                     "footer": "Aurora Monitor",
-                }]
-            }
-
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(
-                self.config.slack_webhook_url,
-                data=data,
-                headers={'Content-Type': 'application/json'}
-            )
-            urllib.request.urlopen(req, timeout=10)
-            alert.sent_to.append("slack")
+                })
+
+            payload = {"attachments": attachments}
+            self._post_json(self.config.slack_webhook_url, _dumps(payload))
+            for alert in alerts:
+                alert.sent_to.append("slack")
             return True
 
         except Exception:
             return False
 
-    def _send_to_webhook(self, alert: Alert) -> bool:
-        """Envia alerta para webhook customizado."""
+    def _send_to_webhook(self, alerts: List[Alert]) -> bool:
+        """Envia lote de alertas para webhook customizado ({"alerts": [...]})."""
         try:
-            payload = alert.to_dict()
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(
-                self.config.custom_webhook_url,
-                data=data,
-                headers={'Content-Type': 'application/json'}
-            )
-            urllib.request.urlopen(req, timeout=10)
-            alert.sent_to.append("webhook")
+            payload = {"alerts": [alert.to_dict() for alert in alerts]}
+            self._post_json(self.config.custom_webhook_url, _dumps(payload))
+            for alert in alerts:
+                alert.sent_to.append("webhook")
             return True
 
         except Exception:
             return False
 
+    def _post_json(self, url: str, data: bytes) -> None:
+        """
+        POST de JSON reutilizando a conexão keep-alive do host.
+
+        Conexão reaproveitada que falha (fechada pelo servidor) é refeita uma vez.
+        Respeita HTTP_PROXY/HTTPS_PROXY/NO_PROXY (túnel CONNECT para https);
+        redirecionamentos não são seguidos.
+
+        Raises:
+            ValueError: URL sem host.
+            http.client.HTTPException, OSError: Falha de rede ou status >= 400.
+        """
+        parts = urlsplit(url)
+        host = parts.hostname
+        if not host:
+            raise ValueError(f"URL de webhook sem host: {url!r}")
+        # Por thread: canais do pool podem postar no mesmo host ao mesmo tempo
+        key = (threading.get_ident(), parts.scheme, host, parts.port)
+        headers = {'Content-Type': 'application/json'}
+
+        proxy = self._proxy_for(parts.scheme, host)
+        if proxy is not None and parts.scheme != "https":
+            # Proxy HTTP simples: a requisição leva a URL absoluta
+            path = parts._replace(fragment="").geturl()
+            headers.update(self._proxy_auth(proxy))
+        else:
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+
+        for attempt in range(2):
+            conn = self._http_conns.get(key)
+            reused = conn is not None
+            if conn is None:
+                conn = self._open_connection(parts.scheme, host, parts.port, proxy)
+                self._http_conns[key] = conn
+            try:
+                conn.request("POST", path, body=data, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                del self._http_conns[key]
+                if reused and attempt == 0:
+                    continue
+                raise
+            if resp.status >= 400:
+                raise http.client.HTTPException(f"HTTP {resp.status} from {host}")
+            return
+
+    @staticmethod
+    def _proxy_for(scheme: str, host: str) -> Optional[SplitResult]:
+        """Proxy configurado no ambiente para o destino, ou None."""
+        proxy = urllib.request.getproxies().get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        return urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    @staticmethod
+    def _proxy_auth(proxy: SplitResult) -> Dict[str, str]:
+        """Cabeçalho Proxy-Authorization (Basic) se o proxy tiver credenciais."""
+        if proxy.username is None:
+            return {}
+        credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+        token = base64.b64encode(credentials.encode()).decode("ascii")
+        return {"Proxy-Authorization": f"Basic {token}"}
+
+    @classmethod
+    def _open_connection(
+        cls,
+        scheme: str,
+        host: str,
+        port: Optional[int],
+        proxy: Optional[SplitResult],
+    ) -> http.client.HTTPConnection:
+        """Abre conexão para o host, direto ou via proxy."""
+        conn_cls = (http.client.HTTPSConnection if scheme == "https"
+                    else http.client.HTTPConnection)
+        if proxy is None:
+            return conn_cls(host, port, timeout=10)
+        if not proxy.hostname:
+            raise ValueError(f"Proxy sem host: {proxy.geturl()!r}")
+        if scheme != "https":
+            return http.client.HTTPConnection(proxy.hostname, proxy.port, timeout=10)
+        conn = conn_cls(proxy.hostname, proxy.port, timeout=10)
+        conn.set_tunnel(host, port, headers=cls._proxy_auth(proxy))
+        return conn
+
     def _send_email(self, alert: Alert) -> bool:
         """Envia alerta por email."""
         # Implementação básica usando smtplib
@@ -324,7 +577,7 @@ class AlertManager:
             from email.mime.text import MIMEText
 
             msg = MIMEText(f"{alert.message}\n\nSource: {alert.source}\nTime: {alert.timestamp}")
-            msg['Subject'] = f"[Aurora] [{alert.level.value.upper()}] {alert.title}"
+            msg['Subject'] = f"[Aurora] [{_LEVEL_LABELS[alert.level]}] {alert.title}"
             msg['From'] = "aurora@localhost"
             msg['To'] = ", ".join(self.config.email_recipients)
 
@@ -353,7 +606,8 @@ class AlertManager:
         Args:
             callback: Função chamada quando alerta é enviado.
         """
-        self._on_alert_callbacks.append(callback)
+        with self._callbacks_lock:
+            self._on_alert_callbacks = self._on_alert_callbacks + (callback,)
 
     def acknowledge(self, alert_id: str, by: str = "system") -> bool:
         """
@@ -366,7 +620,7 @@ class AlertManager:
         Returns:
             True se alerta foi encontrado e reconhecido.
         """
-        with self._lock:
+        with self._history_lock:
             for alert in self._history:
                 if alert.alert_id == alert_id:
                     alert.acknowledged = True
@@ -394,22 +648,38 @@ class AlertManager:
         Returns:
             Lista de alertas.
         """
-        with self._lock:
-            alerts = list(self._history)
-
-        # Aplica filtros
-        if level:
-            alerts = [a for a in alerts if a.level >= level]
-        if source:
-            alerts = [a for a in alerts if source in a.source]
-        if since:
-            alerts = [a for a in alerts if a.timestamp >= since]
-
-        return alerts[-limit:]
+        max_items = limit if limit > 0 else None
+
+        with self._history_lock:
+            if not (level or source or since):
+                # Sem filtros: copia só os últimos `limit` sob o lock
+                recent = list(islice(reversed(self._history), max_items))
+                recent.reverse()
+                return recent
+            if since:
+                # Do fim para o início: copia só a cauda >= since
+                newest_first = list(takewhile(lambda a: a.timestamp >= since,
+                                              reversed(self._history)))
+            else:
+                newest_first = list(reversed(self._history))
+
+        # Aplica filtros do mais recente para trás, parando ao atingir o limite
+        matched = []
+        for a in newest_first:
+            if level and a.level < level:
+                continue
+            if source and source not in a.source:
+                continue
+            matched.append(a)
+            if max_items and len(matched) >= max_items:
+                break
+
+        matched.reverse()
+        return matched
 
     def get_aggregates(self) -> List[AlertAggregate]:
         """Retorna agregações atuais."""
-        with self._lock:
+        with self._aggregates_lock:
             return list(self._aggregates.values())
 
     def get_unacknowledged(self, level: Optional[AlertLevel] = None) -> List[Alert]:
@@ -422,33 +692,36 @@ class AlertManager:
         Returns:
             Lista de alertas não reconhecidos.
         """
-        with self._lock:
-            alerts = [a for a in self._history if not a.acknowledged]
-
-        if level:
-            alerts = [a for a in alerts if a.level >= level]
+        with self._history_lock:
+            if level:
+                # Só as partições de nível >= level
+                parts = [list(alerts) for lvl, alerts in self._history_by_level.items()
+                         if lvl >= level]
+            else:
+                parts = [list(self._history)]
 
-        return alerts
+        if len(parts) == 1:
+            return [a for a in parts[0] if not a.acknowledged]
+        merged = heapq.merge(*parts, key=lambda a: a.timestamp)
+        return [a for a in merged if not a.acknowledged]
 
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas de alertas."""
-        with self._lock:
-            total = len(self._history)
-            by_level = {}
-            by_source = {}
-
-            for alert in self._history:
-                level = alert.level.value
-                by_level[level] = by_level.get(level, 0) + 1
-
-                source = alert.source.split('.')[0]
-                by_source[source] = by_source.get(source, 0) + 1
+        # Últimas 24h
+        cutoff = datetime.now() - timedelta(hours=24)
 
+        # Contadores e índices mantidos em send(); só os não reconhecidos exigem varredura
+        with self._history_lock:
+            total = len(self._history)
+            by_level = {lvl.value: len(alerts)
+                        for lvl, alerts in self._history_by_level.items() if alerts}
+            by_source = dict(self._source_counts)
             unack = sum(1 for a in self._history if not a.acknowledged)
+            last_24h = sum(1 for _ in takewhile(lambda a: a.timestamp >= cutoff,
+                                                reversed(self._history)))
 
-            # Últimas 24h
-            cutoff = datetime.now() - timedelta(hours=24)
-            last_24h = sum(1 for a in self._history if a.timestamp >= cutoff)
+        with self._aggregates_lock:
+            aggregates = len(self._aggregates)
 
         return {
             "enabled": self.config.enabled,
@@ -457,8 +730,8 @@ class AlertManager:
             "last_24_hours": last_24h,
             "by_level": by_level,
             "by_source": by_source,
-            "aggregates": len(self._aggregates),
-            "queue_size": len(self._send_queue),
+            "aggregates": aggregates,
+            "queue_size": self._send_queue.qsize(),
             "channels": {
                 "email": self.config.email_enabled,
                 "slack": self.config.slack_enabled,
@@ -468,13 +741,26 @@ class AlertManager:
 
     def clear_history(self) -> None:
         """Limpa histórico de alertas."""
-        with self._lock:
+        with self._history_lock, self._cooldown_lock, self._aggregates_lock:
             self._history.clear()
-            self._aggregates.clear()
+            for alerts in self._history_by_level.values():
+                alerts.clear()
+            self._source_counts.clear()
             self._last_sent.clear()
+            self._aggregates.clear()
 
     def stop(self) -> None:
         """Para o gerenciador de alertas."""
         self._sender_running = False
         if self._sender_thread and self._sender_thread.is_alive():
+            # Sentinela: o sender esvazia o que já está na fila e encerra
+            self._send_queue.put(None)
             self._sender_thread.join(timeout=5.0)
+
+        pool, self._channel_pool = self._channel_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+        for conn in list(self._http_conns.values()):
+            conn.close()
+        self._http_conns.clear()
@@ -3,14 +3,17 @@ Coletor de métricas do sistema.
 """
 
 import gc
+import operator
 import os
+import re
 import sys
 import socket
 import threading
 import time
-from collections import deque
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Tuple
 
 from aurora_monitor.core.config import MetricsConfig
 from aurora_monitor.collectors.system import (
@@ -32,6 +35,14 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+# Parsers dos fallbacks em /proc (arquivos pequenos, lidos de uma vez em bytes)
+_MEMINFO_RE = re.compile(rb'^(\w+):\s+(\d+)', re.MULTILINE)
+# interface: rx_bytes rx_packets rx_errs (5 colunas rx) tx_bytes tx_packets tx_errs
+_NETDEV_RE = re.compile(
+    rb'^\s*([^:\s]+):\s*(\d+)\s+(\d+)\s+(\d+)(?:\s+\d+){5}\s+(\d+)\s+(\d+)\s+(\d+)',
+    re.MULTILINE,
+)
+
 
 class MetricsCollector:
     """
@@ -46,8 +57,17 @@ class MetricsCollector:
         metrics = collector.collect()
         print(f"CPU: {metrics.cpu_percent}%")
         print(f"Memory: {metrics.memory_percent}%")
+
+    A coleta usa um pool de threads próprio: chame close() ao descartar o
+    coletor, ou use-o como context manager (`with MetricsCollector() as c:`).
+    As threads do pool não entram nas métricas de threads.
     """
 
+    # Prefixo das threads do pool de coleta (excluídas de _collect_threads)
+    POOL_THREAD_PREFIX = "aurora-metrics"
+    # A cada quantas coletas a lista de partições é relida (mounts mudam raramente)
+    PARTITIONS_REFRESH_EVERY = 60
+
     def __init__(self, config: Optional[MetricsConfig] = None):
         """
         Inicializa o coletor.
@@ -56,9 +76,18 @@ class MetricsCollector:
             config: Configuração do coletor. Se não fornecida, usa padrões.
         """
         self.config = config or MetricsConfig()
-        self._history: deque = deque(maxlen=self.config.history_size)
+        # Histórico em ring buffer pré-alocado: escritas ocupam um slot e depois
+        # publicam _hist_idx (total de escritas); leitores não pegam lock.
+        # O slot extra absorve a escrita em andamento ainda não publicada.
+        self._hist_size = max(1, self.config.history_size)
+        self._hist_slots = self._hist_size + 1
+        self._hist_buf: List[Optional[SystemMetrics]] = [None] * self._hist_slots
+        self._hist_idx = 0
+        # Último SystemMetrics despejado do histórico, para reuso (opt-in)
+        self._spare: Optional[SystemMetrics] = None
         self._aggregates: Dict[str, MetricsAggregate] = {}
         self._custom_collectors: Dict[str, Callable[[], float]] = {}
+        self._attrgetters: Dict[str, Callable[[Any], Any]] = {}
         self._lock = threading.Lock()
         self._last_network_io: Optional[Any] = None
         self._last_disk_io: Optional[Any] = None
@@ -69,63 +98,145 @@ class MetricsCollector:
         self._platform = sys.platform
         self._python_version = sys.version.split()[0]
         self._boot_time = psutil.boot_time() if PSUTIL_AVAILABLE else 0.0
+        self._cpu_count_os = os.cpu_count() or 1
+        if PSUTIL_AVAILABLE:
+            self._cpu_count_logical = psutil.cpu_count(logical=True) or 1
+            self._cpu_count_physical = psutil.cpu_count(logical=False) or 1
+        else:
+            self._cpu_count_logical = self._cpu_count_os
+            self._cpu_count_physical = self._cpu_count_os
+        self._partitions: List[Any] = []
+        self._partitions_read_at: Optional[int] = None
+        self._cpu_freq: Optional[Any] = None
+        self._cpu_stats: Optional[Any] = None
+        self._collect_count = 0
+
+        # Coleta em camadas: dados que mudam devagar (frequência de CPU, uso por
+        # partição, conexões) são relidos a cada `slow_collect_ratio` coletas e
+        # repetidos do cache nas demais
+        self._slow_ratio = max(1, self.config.slow_collect_ratio)
+        self._disk_partitions_cache: List[Dict[str, Any]] = []
+        self._connection_counts: Optional[Counter] = None
+
+        # Coletores fixados na inicialização conforme a configuração.
+        # Os de /proc e psutil liberam o GIL nas syscalls: rodam em paralelo
+        io_collectors = [
+            self._collect_cpu,
+            self._collect_memory,
+            self._collect_disk,
+            self._collect_network,
+        ]
+        if self.config.include_process_metrics:
+            io_collectors.append(self._collect_process)
+        self._io_collectors: Tuple[Callable[[SystemMetrics], None], ...] = tuple(io_collectors)
+        # GC e threads são só CPU: rodam na thread chamadora enquanto o pool trabalha
+        self._local_collectors: Tuple[Callable[[SystemMetrics], None], ...] = (
+            self._collect_gc,
+            self._collect_threads,
+        )
+        self._pool: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix=self.POOL_THREAD_PREFIX
+        )
+
+        # Handle do processo atual, reaproveitado entre coletas
+        self._proc: Optional[Any] = None
+
+        # Prepara a base do cpu_percent não bloqueante (a primeira chamada retorna 0.0)
+        if PSUTIL_AVAILABLE:
+            psutil.cpu_percent(interval=None, percpu=True)
+            if self.config.include_process_metrics:
+                self._process_handle().cpu_percent(interval=None)
 
     def collect(self) -> SystemMetrics:
         """
         Coleta todas as métricas do sistema.
 
+        Com `config.reuse_metrics_objects`, o objeto retornado é reciclado
+        (zerado e preenchido de novo) depois de sair do histórico, ou seja,
+        após `history_size + 1` coletas: não guarde referências por mais tempo.
+
         Returns:
             SystemMetrics com todas as métricas coletadas.
         """
-        metrics = SystemMetrics(
-            timestamp=datetime.now(),
-            hostname=self._hostname,
-            platform=self._platform,
-            python_version=self._python_version,
-            boot_time=self._boot_time,
-        )
+        metrics = None
+        if self._spare is not None:
+            with self._lock:
+                metrics, self._spare = self._spare, None
+
+        if metrics is not None:
+            metrics.reset()
+            metrics.timestamp = datetime.now()
+            metrics.timestamp_ns = time.monotonic_ns()
+        else:
+            metrics = SystemMetrics(
+                timestamp=datetime.now(),
+                timestamp_ns=time.monotonic_ns(),
+                hostname=self._hostname,
+                platform=self._platform,
+                python_version=self._python_version,
+                boot_time=self._boot_time,
+            )
+
+        # Coleta métricas; cada coletor escreve só na sua parte de `metrics`
+        pool = self._pool
+        if pool is not None:
+            futures = [pool.submit(fn, metrics) for fn in self._io_collectors]
+        else:
+            futures = []
+            for fn in self._io_collectors:
+                fn(metrics)
 
-        # Coleta métricas
-        self._collect_cpu(metrics)
-        self._collect_memory(metrics)
-        self._collect_disk(metrics)
-        self._collect_network(metrics)
-        self._collect_gc(metrics)
-        self._collect_threads(metrics)
+        for fn in self._local_collectors:
+            fn(metrics)
 
-        if self.config.include_process_metrics:
-            self._collect_process(metrics)
+        for future in futures:
+            future.result()
 
         # Coleta métricas customizadas
         self._collect_custom(metrics)
 
         # Adiciona ao histórico
         with self._lock:
-            self._history.append(metrics)
+            idx = self._hist_idx
+            slot = idx % self._hist_slots
+            evicted = self._hist_buf[slot]
+            self._hist_buf[slot] = metrics
+            self._hist_idx = idx + 1
+            if self.config.reuse_metrics_objects:
+                self._spare = evicted
 
         # Atualiza agregações
         self._update_aggregates(metrics)
 
         self._last_collect_time = time.time()
+        self._collect_count += 1
         return metrics
 
     def _collect_cpu(self, metrics: SystemMetrics) -> None:
-        """Coleta métricas de CPU."""
+        """
+        Coleta métricas de CPU.
+
+        O uso de CPU é medido sem bloquear: reflete o intervalo desde o
+        `collect()` anterior (ou desde a criação do coletor).
+        """
         if PSUTIL_AVAILABLE:
-            # CPU geral
-            metrics.cpu_percent = psutil.cpu_percent(interval=0.1)
+            # CPU por core; a geral é a média dos cores (uma leitura de /proc/stat)
+            per_core = psutil.cpu_percent(interval=None, percpu=True)
+            metrics.cpu.percent_per_core = per_core
+            metrics.cpu_percent = sum(per_core) / len(per_core) if per_core else 0.0
             metrics.cpu.percent = metrics.cpu_percent
 
-            # CPU por core
-            metrics.cpu.percent_per_core = psutil.cpu_percent(percpu=True)
-
             # Contagem de CPUs
-            metrics.cpu.count_logical = psutil.cpu_count(logical=True) or 1
-            metrics.cpu.count_physical = psutil.cpu_count(logical=False) or 1
+            metrics.cpu.count_logical = self._cpu_count_logical
+            metrics.cpu.count_physical = self._cpu_count_physical
+
+            refresh = self._collect_count % self._slow_ratio == 0
 
             # Frequência
             try:
-                freq = psutil.cpu_freq()
+                if refresh:
+                    self._cpu_freq = psutil.cpu_freq()
+                freq = self._cpu_freq
                 if freq:
                     metrics.cpu.frequency_current = freq.current
                     metrics.cpu.frequency_max = freq.max or freq.current
@@ -143,16 +254,19 @@ class MetricsCollector:
 
             # Context switches e interrupts
             try:
-                stats = psutil.cpu_stats()
-                metrics.cpu.context_switches = stats.ctx_switches
-                metrics.cpu.interrupts = stats.interrupts
+                if refresh:
+                    self._cpu_stats = psutil.cpu_stats()
+                stats = self._cpu_stats
+                if stats:
+                    metrics.cpu.context_switches = stats.ctx_switches
+                    metrics.cpu.interrupts = stats.interrupts
             except Exception:
                 pass
         else:
             # Fallback sem psutil
             try:
                 load = os.getloadavg()
-                metrics.cpu_percent = load[0] * 100 / os.cpu_count()
+                metrics.cpu_percent = load[0] * 100 / self._cpu_count_os
                 metrics.cpu.percent = metrics.cpu_percent
                 metrics.cpu.load_average_1m = load[0]
                 metrics.cpu.load_average_5m = load[1]
@@ -190,20 +304,17 @@ class MetricsCollector:
         else:
             # Fallback: lê de /proc/meminfo no Linux
             try:
-                with open('/proc/meminfo') as f:
-                    meminfo = {}
-                    for line in f:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            meminfo[parts[0].rstrip(':')] = int(parts[1]) * 1024
-
-                    metrics.memory.total = meminfo.get('MemTotal', 0)
-                    metrics.memory.free = meminfo.get('MemFree', 0)
-                    metrics.memory.available = meminfo.get('MemAvailable', metrics.memory.free)
-                    metrics.memory.used = metrics.memory.total - metrics.memory.available
-                    if metrics.memory.total > 0:
-                        metrics.memory_percent = (metrics.memory.used / metrics.memory.total) * 100
-                        metrics.memory.percent = metrics.memory_percent
+                with open('/proc/meminfo', 'rb') as f:
+                    data = f.read()
+                meminfo = {key: int(value) * 1024 for key, value in _MEMINFO_RE.findall(data)}
+
+                metrics.memory.total = meminfo.get(b'MemTotal', 0)
+                metrics.memory.free = meminfo.get(b'MemFree', 0)
+                metrics.memory.available = meminfo.get(b'MemAvailable', metrics.memory.free)
+                metrics.memory.used = metrics.memory.total - metrics.memory.available
+                if metrics.memory.total > 0:
+                    metrics.memory_percent = (metrics.memory.used / metrics.memory.total) * 100
+                    metrics.memory.percent = metrics.memory_percent
             except Exception:
                 pass
 
@@ -234,23 +345,30 @@ class MetricsCollector:
             except Exception:
                 pass
 
-            # Partições
+            # Partições (camada lenta)
             try:
-                partitions = psutil.disk_partitions()
-                for part in partitions:
-                    try:
-                        usage = psutil.disk_usage(part.mountpoint)
-                        metrics.disk.partitions.append({
-                            'device': part.device,
-                            'mountpoint': part.mountpoint,
-                            'fstype': part.fstype,
-                            'total': usage.total,
-                            'used': usage.used,
-                            'free': usage.free,
-                            'percent': usage.percent,
-                        })
-                    except Exception:
-                        pass
+                if self._collect_count % self._slow_ratio == 0:
+                    read_at = self._partitions_read_at
+                    if read_at is None or self._collect_count - read_at >= self.PARTITIONS_REFRESH_EVERY:
+                        self._partitions = psutil.disk_partitions()
+                        self._partitions_read_at = self._collect_count
+                    partitions = []
+                    for part in self._partitions:
+                        try:
+                            usage = psutil.disk_usage(part.mountpoint)
+                            partitions.append({
+                                'device': part.device,
+                                'mountpoint': part.mountpoint,
+                                'fstype': part.fstype,
+                                'total': usage.total,
+                                'used': usage.used,
+                                'free': usage.free,
+                                'percent': usage.percent,
+                            })
+                        except Exception:
+                            pass
+                    self._disk_partitions_cache = partitions
+                metrics.disk.partitions = self._disk_partitions_cache
             except Exception:
                 pass
         else:
@@ -284,74 +402,84 @@ class MetricsCollector:
             except Exception:
                 pass
 
-            # Conexões
+            # Conexões (camada lenta)
             try:
-                connections = psutil.net_connections(kind='inet')
-                metrics.network.connections_established = sum(
-                    1 for c in connections if c.status == 'ESTABLISHED'
-                )
-                metrics.network.connections_time_wait = sum(
-                    1 for c in connections if c.status == 'TIME_WAIT'
-                )
-                metrics.network.connections_close_wait = sum(
-                    1 for c in connections if c.status == 'CLOSE_WAIT'
-                )
+                if self._collect_count % self._slow_ratio == 0:
+                    connections = psutil.net_connections(kind='inet')
+                    self._connection_counts = Counter(c.status for c in connections)
+                status_counts = self._connection_counts or Counter()
+                metrics.network.connections_established = status_counts['ESTABLISHED']
+                metrics.network.connections_time_wait = status_counts['TIME_WAIT']
+                metrics.network.connections_close_wait = status_counts['CLOSE_WAIT']
             except (psutil.AccessDenied, Exception):
                 pass
         else:
             # Fallback: lê de /proc/net/dev no Linux
             try:
-                with open('/proc/net/dev') as f:
-                    for line in f:
-                        if ':' in line and 'lo' not in line:
-                            parts = line.split(':')[1].split()
-                            if len(parts) >= 16:
-                                metrics.network.bytes_recv += int(parts[0])
-                                metrics.network.bytes_sent += int(parts[8])
-                                metrics.network.packets_recv += int(parts[1])
-                                metrics.network.packets_sent += int(parts[9])
-                                metrics.network.errors_in += int(parts[2])
-                                metrics.network.errors_out += int(parts[10])
-
-                    metrics.network_bytes_sent = metrics.network.bytes_sent
-                    metrics.network_bytes_recv = metrics.network.bytes_recv
+                with open('/proc/net/dev', 'rb') as f:
+                    data = f.read()
+                for iface, rx_bytes, rx_packets, rx_errs, tx_bytes, tx_packets, tx_errs in (
+                    _NETDEV_RE.findall(data)
+                ):
+                    if iface == b'lo':
+                        continue
+                    metrics.network.bytes_recv += int(rx_bytes)
+                    metrics.network.bytes_sent += int(tx_bytes)
+                    metrics.network.packets_recv += int(rx_packets)
+                    metrics.network.packets_sent += int(tx_packets)
+                    metrics.network.errors_in += int(rx_errs)
+                    metrics.network.errors_out += int(tx_errs)
+
+                metrics.network_bytes_sent = metrics.network.bytes_sent
+                metrics.network_bytes_recv = metrics.network.bytes_recv
             except Exception:
                 pass
 
+    def _process_handle(self) -> Any:
+        """Retorna o psutil.Process do processo atual (recriado após fork)."""
+        proc = self._proc
+        if proc is None or proc.pid != os.getpid():
+            proc = self._proc = psutil.Process()
+        return proc
+
     def _collect_process(self, metrics: SystemMetrics) -> None:
         """Coleta métricas do processo atual."""
         if PSUTIL_AVAILABLE:
             try:
-                proc = psutil.Process()
+                proc = self._process_handle()
                 metrics.process.pid = proc.pid
-                metrics.process.cpu_percent = proc.cpu_percent()
-                metrics.process.memory_percent = proc.memory_percent()
-
-                mem_info = proc.memory_info()
-                metrics.process.memory_rss = mem_info.rss
-                metrics.process.memory_vms = mem_info.vms
-
-                metrics.process.num_threads = proc.num_threads()
-                metrics.process.status = proc.status()
-                metrics.process.create_time = proc.create_time()
-
-                # File descriptors (Unix)
-                try:
-                    metrics.process.num_fds = proc.num_fds()
-                except (AttributeError, psutil.AccessDenied):
-                    pass
-
-                # Open files
-                try:
-                    metrics.process.open_files = len(proc.open_files())
-                except (psutil.AccessDenied, Exception):
-                    pass
-
-                # Connections
-                try:
-                    metrics.process.connections = len(proc.connections())
-                except (psutil.AccessDenied, Exception):
-                    pass
+
+                # oneshot() lê /proc/<pid>/stat e status uma única vez
+                # para todas as chamadas abaixo
+                with proc.oneshot():
+                    metrics.process.cpu_percent = proc.cpu_percent()
+                    metrics.process.memory_percent = proc.memory_percent()
+
+                    mem_info = proc.memory_info()
+                    metrics.process.memory_rss = mem_info.rss
+                    metrics.process.memory_vms = mem_info.vms
+
+                    metrics.process.num_threads = proc.num_threads()
+                    metrics.process.status = proc.status()
+                    metrics.process.create_time = proc.create_time()
+
+                    # File descriptors (Unix)
+                    try:
+                        metrics.process.num_fds = proc.num_fds()
+                    except (AttributeError, psutil.AccessDenied):
+                        pass
+
+                    # Open files
+                    try:
+                        metrics.process.open_files = len(proc.open_files())
+                    except (psutil.AccessDenied, Exception):
+                        pass
+
+                    # Connections
+                    try:
+                        metrics.process.connections = len(proc.connections())
+                    except (psutil.AccessDenied, Exception):
+                        pass
             except Exception:
                 pass
         else:
@@ -383,12 +511,29 @@ class MetricsCollector:
             pass
 
     def _collect_threads(self, metrics: SystemMetrics) -> None:
-        """Coleta métricas de threads."""
+        """Coleta métricas de threads (sem as threads do pool de coleta)."""
         try:
-            threads = threading.enumerate()
-            metrics.threads.active_count = len(threads)
-            metrics.threads.daemon_count = sum(1 for t in threads if t.daemon)
-            metrics.threads.alive_threads = [t.name for t in threads if t.is_alive()]
+            prefix = self.POOL_THREAD_PREFIX
+            active_count = daemon_count = 0
+            if self.config.include_thread_names:
+                alive = metrics.threads.alive_threads
+                for t in threading.enumerate():
+                    if t.name.startswith(prefix):
+                        continue
+                    active_count += 1
+                    if t.daemon:
+                        daemon_count += 1
+                    if t.is_alive():
+                        alive.append(t.name)
+            else:
+                for t in threading.enumerate():
+                    if t.name.startswith(prefix):
+                        continue
+                    active_count += 1
+                    if t.daemon:
+                        daemon_count += 1
+            metrics.threads.active_count = active_count
+            metrics.threads.daemon_count = daemon_count
         except Exception:
             pass
 
@@ -415,6 +560,18 @@ class MetricsCollector:
                     self._aggregates[name] = MetricsAggregate(metric_name=name)
                 self._aggregates[name].add_sample(value)
 
+    def close(self) -> None:
+        """Encerra o pool de coleta; coletas seguintes rodam sequencialmente."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "MetricsCollector":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
     def register_collector(self, name: str, collector: Callable[[], float]) -> None:
         """
         Registra um coletor de métrica customizado.
@@ -432,10 +589,24 @@ class MetricsCollector:
         Returns:
             SystemMetrics mais recente ou None se não houver.
         """
-        with self._lock:
-            if self._history:
-                return self._history[-1]
-        return None
+        idx = self._hist_idx
+        if idx == 0:
+            return None
+        return self._hist_buf[(idx - 1) % self._hist_slots]
+
+    def _snapshot(self, count: int) -> List[SystemMetrics]:
+        """Lê até `count` amostras mais recentes do ring buffer, sem lock."""
+        end = self._hist_idx
+        start = max(0, end - min(count, self._hist_size))
+        buf = self._hist_buf
+        slots = self._hist_slots
+        items = [buf[i % slots] for i in range(start, end)]
+
+        # Descarta slots que escritas concorrentes possam ter sobrescrito
+        overwritten = self._hist_idx - self._hist_size - start
+        if overwritten > 0:
+            items = items[overwritten:]
+        return [m for m in items if m is not None]
 
     def get_history(self, count: Optional[int] = None) -> List[SystemMetrics]:
         """
@@ -447,10 +618,9 @@ class MetricsCollector:
         Returns:
             Lista de SystemMetrics do histórico.
         """
-        with self._lock:
-            if count is None:
-                return list(self._history)
-            return list(self._history)[-count:]
+        if count is None or count <= 0:
+            count = self._hist_size
+        return self._snapshot(count)
 
     def get_aggregate(self, metric_name: str) -> Optional[MetricsAggregate]:
         """
@@ -471,7 +641,8 @@ class MetricsCollector:
     def clear_history(self) -> None:
         """Limpa histórico de métricas."""
         with self._lock:
-            self._history.clear()
+            self._hist_buf = [None] * self._hist_slots
+            self._hist_idx = 0
             self._aggregates.clear()
 
     def get_rate(self, metric_name: str) -> float:
@@ -479,25 +650,34 @@ class MetricsCollector:
         Calcula taxa de variação de uma métrica.
 
         Args:
-            metric_name: Nome da métrica (ex: 'network_bytes_sent').
+            metric_name: Nome da métrica (ex: 'network_bytes_sent' ou
+                'network.errors_in').
 
         Returns:
             Taxa de variação por segundo.
         """
-        with self._lock:
-            if len(self._history) < 2:
-                return 0.0
-
-            latest = self._history[-1]
-            previous = self._history[-2]
+        recent = self._snapshot(2)
+        if len(recent) < 2:
+            return 0.0
 
-            # Obtém valores usando getattr
-            latest_value = getattr(latest, metric_name, 0)
-            previous_value = getattr(previous, metric_name, 0)
+        previous, latest = recent
 
-            # Calcula intervalo de tempo
+        # Obtém valores com attrgetter em cache por nome de métrica
+        getter = self._attrgetters.get(metric_name)
+        if getter is None:
+            getter = self._attrgetters.setdefault(metric_name, operator.attrgetter(metric_name))
+        try:
+            latest_value = getter(latest)
+            previous_value = getter(previous)
+        except AttributeError:
+            return 0.0
+
+        # Calcula intervalo de tempo (monotônico quando disponível)
+        if latest.timestamp_ns and previous.timestamp_ns:
+            time_diff = (latest.timestamp_ns - previous.timestamp_ns) / 1e9
+        else:
             time_diff = (latest.timestamp - previous.timestamp).total_seconds()
-            if time_diff <= 0:
-                return 0.0
+        if time_diff <= 0:
+            return 0.0
 
-            return (latest_value - previous_value) / time_diff
+        return (latest_value - previous_value) / time_diff
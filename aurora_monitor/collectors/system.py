@@ -2,14 +2,22 @@
 Métricas de sistema - Estruturas de dados para métricas.
 """
 
+from bisect import insort
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterable, Tuple
 from datetime import datetime
+from operator import attrgetter
 import os
 import sys
 
 
-@dataclass
+# __slots__ nos dataclasses de métricas (Python 3.10+): o histórico retém
+# history_size snapshots, cada um com oito sub-objetos
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class CPUMetrics:
     """Métricas detalhadas de CPU."""
     percent: float = 0.0
@@ -25,7 +33,7 @@ class CPUMetrics:
     interrupts: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MemoryMetrics:
     """Métricas detalhadas de memória."""
     total: int = 0  # bytes
@@ -41,7 +49,7 @@ class MemoryMetrics:
     cached: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DiskMetrics:
     """Métricas detalhadas de disco."""
     total: int = 0  # bytes
@@ -57,7 +65,7 @@ class DiskMetrics:
     partitions: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NetworkMetrics:
     """Métricas detalhadas de rede."""
     bytes_sent: int = 0
@@ -73,7 +81,7 @@ class NetworkMetrics:
     connections_close_wait: int = 0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ProcessMetrics:
     """Métricas do processo atual."""
     pid: int = 0
@@ -89,7 +97,7 @@ class ProcessMetrics:
     create_time: float = 0.0
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class GCMetrics:
     """Métricas do Garbage Collector."""
     collections_gen0: int = 0
@@ -105,7 +113,7 @@ class GCMetrics:
     gc_enabled: bool = True
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ThreadMetrics:
     """Métricas de threads."""
     active_count: int = 0
@@ -114,7 +122,37 @@ class ThreadMetrics:
     blocked_threads: List[str] = field(default_factory=list)
 
 
-@dataclass
+# Campos exportados por SystemMetrics.to_dict: (seção, chaves); os valores são
+# lidos de uma vez por attrgetter e combinados com dict(zip(...)), ambos em C
+_TOP_DICT_KEYS = (
+    "cpu_percent", "memory_percent", "disk_percent",
+    "network_bytes_sent", "network_bytes_recv",
+)
+_INFO_DICT_KEYS = ("hostname", "platform", "python_version")
+_SECTION_DICT_KEYS = (
+    ("cpu", (
+        "percent", "percent_per_core", "count_logical", "count_physical",
+        "load_average_1m", "load_average_5m", "load_average_15m",
+    )),
+    ("memory", ("total", "available", "used", "percent", "swap_percent")),
+    ("disk", ("total", "used", "free", "percent", "read_bytes", "write_bytes")),
+    ("network", (
+        "bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+        "errors_in", "errors_out",
+    )),
+    ("process", ("pid", "cpu_percent", "memory_percent", "memory_rss", "num_threads")),
+    ("gc", ("collections_gen0", "collections_gen1", "collections_gen2")),
+    ("threads", ("active_count", "daemon_count")),
+)
+_TOP_DICT_GETTER = attrgetter(*_TOP_DICT_KEYS)
+_INFO_DICT_GETTER = attrgetter(*_INFO_DICT_KEYS)
+_SECTION_DICT_GETTERS = tuple(
+    (section, attrgetter(section), keys, attrgetter(*keys))
+    for section, keys in _SECTION_DICT_KEYS
+)
+
+
+@dataclass(**_SLOTS)
 class SystemMetrics:
     """
     Métricas consolidadas do sistema.
@@ -122,8 +160,10 @@ class SystemMetrics:
     Esta é a estrutura principal retornada pelo MetricsCollector
     contendo todas as métricas do sistema em um único objeto.
     """
-    # Timestamp
+    # Timestamp (relógio de parede) e instante monotônico em ns, usado para
+    # intervalos entre amostras; 0 quando a amostra não veio do coletor
     timestamp: datetime = field(default_factory=datetime.now)
+    timestamp_ns: int = 0
 
     # Métricas básicas (para compatibilidade)
     cpu_percent: float = 0.0
@@ -147,67 +187,34 @@ class SystemMetrics:
     python_version: str = ""
     boot_time: float = 0.0
 
+    def reset(self) -> None:
+        """
+        Zera as métricas in-place, reaproveitando os sub-objetos.
+
+        Timestamps e informações do sistema (hostname, platform, ...) são
+        mantidos; quem reutiliza o objeto deve atualizar os timestamps.
+        """
+        self.cpu_percent = 0.0
+        self.memory_percent = 0.0
+        self.disk_percent = 0.0
+        self.network_bytes_sent = 0
+        self.network_bytes_recv = 0
+        sections: Tuple[Any, ...] = (
+            self.cpu, self.memory, self.disk, self.network,
+            self.process, self.gc, self.threads,
+        )
+        for section in sections:
+            # Reexecuta o __init__ do dataclass: volta aos defaults sem realocar
+            section.__init__()
+
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário."""
-        return {
-            "timestamp": self.timestamp.isoformat(),
-            "cpu_percent": self.cpu_percent,
-            "memory_percent": self.memory_percent,
-            "disk_percent": self.disk_percent,
-            "network_bytes_sent": self.network_bytes_sent,
-            "network_bytes_recv": self.network_bytes_recv,
-            "cpu": {
-                "percent": self.cpu.percent,
-                "percent_per_core": self.cpu.percent_per_core,
-                "count_logical": self.cpu.count_logical,
-                "count_physical": self.cpu.count_physical,
-                "load_average_1m": self.cpu.load_average_1m,
-                "load_average_5m": self.cpu.load_average_5m,
-                "load_average_15m": self.cpu.load_average_15m,
-            },
-            "memory": {
-                "total": self.memory.total,
-                "available": self.memory.available,
-                "used": self.memory.used,
-                "percent": self.memory.percent,
-                "swap_percent": self.memory.swap_percent,
-            },
-            "disk": {
-                "total": self.disk.total,
-                "used": self.disk.used,
-                "free": self.disk.free,
-                "percent": self.disk.percent,
-                "read_bytes": self.disk.read_bytes,
-                "write_bytes": self.disk.write_bytes,
-            },
-            "network": {
-                "bytes_sent": self.network.bytes_sent,
-                "bytes_recv": self.network.bytes_recv,
-                "packets_sent": self.network.packets_sent,
-                "packets_recv": self.network.packets_recv,
-                "errors_in": self.network.errors_in,
-                "errors_out": self.network.errors_out,
-            },
-            "process": {
-                "pid": self.process.pid,
-                "cpu_percent": self.process.cpu_percent,
-                "memory_percent": self.process.memory_percent,
-                "memory_rss": self.process.memory_rss,
-                "num_threads": self.process.num_threads,
-            },
-            "gc": {
-                "collections_gen0": self.gc.collections_gen0,
-                "collections_gen1": self.gc.collections_gen1,
-                "collections_gen2": self.gc.collections_gen2,
-            },
-            "threads": {
-                "active_count": self.threads.active_count,
-                "daemon_count": self.threads.daemon_count,
-            },
-            "hostname": self.hostname,
-            "platform": self.platform,
-            "python_version": self.python_version,
-        }
+        result: Dict[str, Any] = {"timestamp": self.timestamp.isoformat()}
+        result.update(zip(_TOP_DICT_KEYS, _TOP_DICT_GETTER(self)))
+        for section, get_section, keys, get_values in _SECTION_DICT_GETTERS:
+            result[section] = dict(zip(keys, get_values(get_section(self))))
+        result.update(zip(_INFO_DICT_KEYS, _INFO_DICT_GETTER(self)))
+        return result
 
     def is_healthy(
         self,
@@ -271,7 +278,7 @@ class SystemMetrics:
         return alerts
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MetricsSample:
     """Amostra de métricas com estatísticas."""
     timestamp: datetime
@@ -284,9 +291,114 @@ class MetricsSample:
             self.timestamp = datetime.now()
 
 
-@dataclass
+def _compute_stats_kernel(
+    samples: Iterable[float],
+    percentiles: bool = True,
+) -> Tuple[float, float, float, float]:
+    """
+    Calcula (std_dev, p50, p90, p99) de uma sequência de amostras.
+
+    Uma única ordenação (feita em C por `sorted`) serve aos três percentis;
+    com `percentiles=False` não há ordenação e os percentis voltam 0.0.
+    A variância usa duas passadas sobre a lista já materializada.
+    """
+    values = sorted(samples) if percentiles else list(samples)
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0, 0.0, 0.0
+
+    std_dev = 0.0
+    if n > 1:
+        mean = sum(values) / n
+        variance = sum([(x - mean) * (x - mean) for x in values]) / (n - 1)
+        std_dev = variance ** 0.5
+
+    if not percentiles:
+        return std_dev, 0.0, 0.0, 0.0
+
+    last = n - 1
+    return (
+        std_dev,
+        values[min(50 * n // 100, last)],
+        values[min(90 * n // 100, last)],
+        values[min(99 * n // 100, last)],
+    )
+
+
+class _P2Quantile:
+    """
+    Estimador de quantil em streaming (algoritmo P² de Jain & Chlamtac).
+
+    Mantém cinco marcadores por quantil: memória O(1) e atualização O(1),
+    com erro tipicamente abaixo de 1% para distribuições suaves.
+    """
+
+    __slots__ = ("p", "heights", "positions", "desired", "increments")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights: List[float] = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.increments = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, x: float) -> None:
+        """Incorpora uma observação."""
+        q = self.heights
+        if len(q) < 5:
+            insort(q, x)
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        desired = self.desired
+        for i, inc in enumerate(self.increments):
+            desired[i] += inc
+
+        for i in (1, 2, 3):
+            d = desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                # Interpolação parabólica; se sair do intervalo, linear
+                qp = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = qp
+                n[i] += s
+
+    def value(self) -> float:
+        """Estimativa atual do quantil."""
+        q = self.heights
+        if len(q) < 5:
+            return q[min(int(self.p * len(q)), len(q) - 1)] if q else 0.0
+        return q[2]
+
+
+@dataclass(**_SLOTS)
 class MetricsAggregate:
-    """Agregação de métricas."""
+    """
+    Agregação de métricas.
+
+    count/sum/min/max/avg cobrem todas as amostras (avg é atualizado em
+    `compute_stats`). Percentis também: exatos
+    enquanto todas as amostras cabem na janela `samples`, estimados em
+    streaming (P²) depois disso. O desvio padrão usa a janela.
+    """
     metric_name: str
     count: int = 0
     sum: float = 0.0
@@ -297,35 +409,39 @@ class MetricsAggregate:
     percentile_50: float = 0.0
     percentile_90: float = 0.0
     percentile_99: float = 0.0
-    samples: List[float] = field(default_factory=list)
+    samples: deque = field(default_factory=lambda: deque(maxlen=1000))
+    _quantiles: tuple = field(
+        default_factory=lambda: (_P2Quantile(0.5), _P2Quantile(0.9), _P2Quantile(0.99)),
+        repr=False,
+        compare=False,
+    )
 
     def add_sample(self, value: float) -> None:
         """Adiciona uma amostra à agregação."""
         self.samples.append(value)
+        for estimator in self._quantiles:
+            estimator.add(value)
         self.count += 1
         self.sum += value
-        self.min = min(self.min, value)
-        self.max = max(self.max, value)
-        self.avg = self.sum / self.count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
 
     def compute_stats(self) -> None:
         """Calcula estatísticas avançadas."""
         if not self.samples:
             return
 
-        sorted_samples = sorted(self.samples)
-        n = len(sorted_samples)
-
-        # Desvio padrão
-        if n > 1:
-            variance = sum((x - self.avg) ** 2 for x in sorted_samples) / (n - 1)
-            self.std_dev = variance ** 0.5
+        self.avg = self.sum / self.count
 
-        # Percentis
-        def percentile(p: float) -> float:
-            idx = int(p * n / 100)
-            return sorted_samples[min(idx, n - 1)]
+        # Percentis exatos só enquanto a janela contém todas as amostras;
+        # depois disso valem as estimativas de streaming e não há ordenação
+        exact = self.count <= len(self.samples)
+        std_dev, p50, p90, p99 = _compute_stats_kernel(self.samples, percentiles=exact)
+        if not exact:
+            p50, p90, p99 = (estimator.value() for estimator in self._quantiles)
 
-        self.percentile_50 = percentile(50)
-        self.percentile_90 = percentile(90)
-        self.percentile_99 = percentile(99)
+        # Desvio padrão usa a média da janela, não do histórico completo
+        self.std_dev = std_dev
+        self.percentile_50, self.percentile_90, self.percentile_99 = p50, p90, p99
@@ -2,15 +2,51 @@
 Configuração central do Aurora Monitor.
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field, fields, is_dataclass, replace as _dataclass_replace
+from typing import Callable, Dict, FrozenSet, List, Optional, Any, Tuple
 from enum import Enum
+import functools
 import json
 import os
+import sys
 
+# Tenta importar orjson (opcional: leitura/gravação JSON mais rápida)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-class LogLevel(Enum):
-    """Níveis de log suportados."""
+
+def _loads(data: bytes) -> Any:
+    """Desserializa JSON UTF-8 (orjson se disponível)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serializa para JSON UTF-8 compacto (orjson ou o encoder C do json)."""
+    if ORJSON_AVAILABLE:
+        data: bytes = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return data
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _dumps_pretty(obj: Any) -> bytes:
+    """Serializa para JSON UTF-8 indentado (orjson se disponível)."""
+    if ORJSON_AVAILABLE:
+        data: bytes = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return data
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+# __slots__ nos dataclasses de configuração (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+class LogLevel(str, Enum):
+    """Níveis de log suportados (membros são str: serializam direto em JSON)."""
     DEBUG = "DEBUG"
     INFO = "INFO"
     WARNING = "WARNING"
@@ -18,7 +54,72 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
-@dataclass
+# Busca direta valor -> membro (evita o caminho de Enum.__call__)
+_LOG_LEVELS: Dict[str, LogLevel] = {member.value: member for member in LogLevel}
+
+
+def _log_level(value: str) -> LogLevel:
+    """Converte o nome do nível em LogLevel (ValueError se desconhecido)."""
+    try:
+        return _LOG_LEVELS[value]
+    except (KeyError, TypeError):
+        raise ValueError(f"{value!r} is not a valid LogLevel") from None
+
+
+def _split_emails(value: str) -> Tuple[str, ...]:
+    """Lista de e-mails separada por vírgula (tupla: o resultado fica em cache)."""
+    return tuple(value.split(","))
+
+
+# Variáveis lidas por MonitorConfig.from_env: (variável, seção, campo, conversão).
+# Seção None = campo de MonitorConfig.
+_ENV_MAP: Tuple[Tuple[str, Optional[str], str, Callable[[str], Any]], ...] = (
+    ("AURORA_APP_NAME", None, "app_name", str),
+    ("AURORA_ENVIRONMENT", None, "environment", str),
+    ("AURORA_LOG_LEVEL", None, "log_level", _log_level),
+    ("AURORA_LOG_FILE", None, "log_file", str),
+    # Métricas
+    ("AURORA_CPU_THRESHOLD", "metrics", "cpu_threshold", float),
+    ("AURORA_MEMORY_THRESHOLD", "metrics", "memory_threshold", float),
+    # Circuit Breaker
+    ("AURORA_CB_FAILURE_THRESHOLD", "circuit_breaker", "failure_threshold", int),
+    ("AURORA_CB_TIMEOUT", "circuit_breaker", "timeout", float),
+    # Rate Limiter
+    ("AURORA_RATE_LIMIT_RPS", "rate_limiter", "requests_per_second", float),
+    # Alertas
+    ("AURORA_ALERT_EMAILS", "alerts", "email_recipients", _split_emails),
+    ("AURORA_SLACK_WEBHOOK", "alerts", "slack_webhook_url", str),
+)
+_ENV_NAMES = tuple(entry[0] for entry in _ENV_MAP)
+# Aceitam string vazia; as demais variáveis vazias são ignoradas
+_ENV_ALLOW_EMPTY: FrozenSet[str] = frozenset({"AURORA_APP_NAME", "AURORA_ENVIRONMENT", "AURORA_LOG_FILE"})
+# Configurar o destino também habilita o canal de alerta
+_ENV_ENABLES: Dict[str, Tuple[str, str]] = {
+    "AURORA_ALERT_EMAILS": ("alerts", "email_enabled"),
+    "AURORA_SLACK_WEBHOOK": ("alerts", "slack_enabled"),
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _env_overrides(values: Tuple[Optional[str], ...]) -> Tuple[Tuple[Optional[str], str, Any], ...]:
+    """
+    Converte os valores das variáveis de _ENV_MAP em overrides (seção, campo, valor).
+
+    Memoizado pelos valores lidos a cada chamada de from_env: mudanças no
+    ambiente geram nova chave. Os overrides são imutáveis e aplicados a uma
+    configuração nova a cada chamada, então nenhum objeto mutável é compartilhado.
+    """
+    overrides: List[Tuple[Optional[str], str, Any]] = []
+    for (name, section, attr, conv), value in zip(_ENV_MAP, values):
+        if value is None or (not value and name not in _ENV_ALLOW_EMPTY):
+            continue
+        overrides.append((section, attr, conv(value)))
+        if name in _ENV_ENABLES:
+            overrides.append((*_ENV_ENABLES[name], True))
+    return tuple(overrides)
+
+
+@dataclass(**_SLOTS)
 class MetricsConfig:
     """Configuração de coleta de métricas."""
     enabled: bool = True
@@ -28,10 +129,13 @@ class MetricsConfig:
     disk_threshold: float = 90.0  # porcentagem
     network_error_threshold: int = 100  # erros por minuto
     include_process_metrics: bool = True
+    include_thread_names: bool = False  # lista nomes das threads vivas
+    reuse_metrics_objects: bool = False  # recicla SystemMetrics que saem do histórico
+    slow_collect_ratio: int = 10  # coletas lentas (partições, conexões) a cada N ticks
     history_size: int = 1000  # número de pontos a manter
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnomalyConfig:
     """Configuração de detecção de anomalias."""
     enabled: bool = True
@@ -42,7 +146,7 @@ class AnomalyConfig:
     trend_window: int = 300  # segundos para análise de tendência
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CircuitBreakerConfig:
     """Configuração do circuit breaker."""
     enabled: bool = True
@@ -53,7 +157,7 @@ class CircuitBreakerConfig:
     excluded_exceptions: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RateLimiterConfig:
     """Configuração do rate limiter."""
     enabled: bool = True
@@ -64,7 +168,7 @@ class RateLimiterConfig:
     client_burst_size: int = 20
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AutoHealerConfig:
     """Configuração do auto-healer."""
     enabled: bool = True
@@ -77,7 +181,7 @@ class AutoHealerConfig:
     cache_clear_on_memory: bool = True
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WatchdogConfig:
     """Configuração do watchdog de processos."""
     enabled: bool = True
@@ -89,7 +193,7 @@ class WatchdogConfig:
     deadlock_detection: bool = True
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AlertConfig:
     """Configuração de alertas."""
     enabled: bool = True
@@ -104,7 +208,7 @@ class AlertConfig:
     aggregation_window: float = 60.0  # segundos
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class HealthCheckConfig:
     """Configuração de health checks."""
     enabled: bool = True
@@ -114,7 +218,7 @@ class HealthCheckConfig:
     custom_checks: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DashboardConfig:
     """Configuração do dashboard."""
     enabled: bool = False
@@ -125,7 +229,32 @@ class DashboardConfig:
     refresh_interval: float = 5.0  # segundos
 
 
-@dataclass
+# Cache de MonitorConfig.from_file: path -> (st_mtime_ns, st_size, dados, campos mutáveis).
+# Os dados ficam compartilhados; só listas/dicts são copiados a cada carga.
+_FILE_CACHE: Dict[str, Tuple[int, int, Dict[str, Any], Tuple[Tuple[Optional[str], str], ...]]] = {}
+_JSON_CONTAINERS = (dict, list)
+
+
+def _json_copy(obj: Any) -> Any:
+    """Cópia profunda de dados vindos de JSON (só dicts e listas são mutáveis)."""
+    if type(obj) is dict:
+        return {k: _json_copy(v) if type(v) in _JSON_CONTAINERS else v for k, v in obj.items()}
+    return [_json_copy(v) if type(v) in _JSON_CONTAINERS else v for v in obj]
+
+
+def _mutable_fields(data: Dict[str, Any]) -> Tuple[Tuple[Optional[str], str], ...]:
+    """Lista os campos (seção, nome) que from_dict preencheria com listas/dicts."""
+    paths: List[Tuple[Optional[str], str]] = []
+    for key, value in data.items():
+        if key in _COMPONENT_FIELDS and type(value) is dict:
+            paths.extend((key, name) for name, item in value.items()
+                         if type(item) in _JSON_CONTAINERS)
+        elif key in _SCALAR_FIELDS and type(value) in _JSON_CONTAINERS:
+            paths.append((None, key))
+    return tuple(paths)
+
+
+@dataclass(**_SLOTS)
 class MonitorConfig:
     """
     Configuração principal do Aurora Monitor.
@@ -159,201 +288,175 @@ class MonitorConfig:
 
     @classmethod
     def from_file(cls, path: str) -> "MonitorConfig":
-        """Carrega configuração de um arquivo JSON."""
-        with open(path, "r") as f:
-            data = json.load(f)
-        return cls.from_dict(data)
+        """
+        Carrega configuração de um arquivo JSON.
+
+        O conteúdo parseado fica em cache por (path, mtime, tamanho): enquanto o
+        arquivo não muda, a carga custa um os.stat em vez de leitura e parsing.
+        """
+        st = os.stat(path)
+        cached = _FILE_CACHE.get(path)
+        if cached is None or cached[0] != st.st_mtime_ns or cached[1] != st.st_size:
+            with open(path, "rb") as f:
+                data = _loads(f.read())
+            cached = _FILE_CACHE[path] = (st.st_mtime_ns, st.st_size, data, _mutable_fields(data))
+
+        config = cls.from_dict(cached[2])
+
+        # Listas/dicts não podem ser compartilhados com o cache
+        for section, name in cached[3]:
+            target = config if section is None else getattr(config, section)
+            setattr(target, name, _json_copy(getattr(target, name)))
+        return config
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "MonitorConfig":
         """Cria configuração a partir de um dicionário."""
-        config = cls()
+        kwargs: Dict[str, Any] = {}
 
-        # Configuração geral
-        if "app_name" in data:
-            config.app_name = data["app_name"]
-        if "environment" in data:
-            config.environment = data["environment"]
-        if "log_level" in data:
-            config.log_level = LogLevel(data["log_level"])
-        if "log_file" in data:
-            config.log_file = data["log_file"]
-
-        # Componentes
-        if "metrics" in data:
-            config.metrics = MetricsConfig(**data["metrics"])
-        if "anomaly" in data:
-            config.anomaly = AnomalyConfig(**data["anomaly"])
-        if "circuit_breaker" in data:
-            config.circuit_breaker = CircuitBreakerConfig(**data["circuit_breaker"])
-        if "rate_limiter" in data:
-            config.rate_limiter = RateLimiterConfig(**data["rate_limiter"])
-        if "auto_healer" in data:
-            config.auto_healer = AutoHealerConfig(**data["auto_healer"])
-        if "watchdog" in data:
-            config.watchdog = WatchdogConfig(**data["watchdog"])
-        if "alerts" in data:
-            config.alerts = AlertConfig(**data["alerts"])
-        if "health_check" in data:
-            config.health_check = HealthCheckConfig(**data["health_check"])
-        if "dashboard" in data:
-            config.dashboard = DashboardConfig(**data["dashboard"])
-
-        if "custom_config" in data:
-            config.custom_config = data["custom_config"]
+        # Uma passada sobre os itens; chaves desconhecidas são ignoradas.
+        # Um único construtor no fim evita criar componentes padrão descartáveis.
+        for key, value in data.items():
+            component = _COMPONENT_FIELDS.get(key)
+            if component is not None:
+                kwargs[key] = component(**value)
+            elif key in _SCALAR_FIELDS:
+                kwargs[key] = value
+            elif key == "log_level":
+                kwargs[key] = _log_level(value)
 
-        return config
+        return cls(**kwargs)
 
     @classmethod
     def from_env(cls) -> "MonitorConfig":
-        """Cria configuração a partir de variáveis de ambiente."""
-        config = cls()
-
-        # Lê variáveis de ambiente com prefixo AURORA_
-        config.app_name = os.getenv("AURORA_APP_NAME", config.app_name)
-        config.environment = os.getenv("AURORA_ENVIRONMENT", config.environment)
+        """
+        Cria configuração a partir de variáveis de ambiente.
 
-        if log_level := os.getenv("AURORA_LOG_LEVEL"):
-            config.log_level = LogLevel(log_level)
-
-        config.log_file = os.getenv("AURORA_LOG_FILE", config.log_file)
-
-        # Métricas
-        if cpu_threshold := os.getenv("AURORA_CPU_THRESHOLD"):
-            config.metrics.cpu_threshold = float(cpu_threshold)
-        if memory_threshold := os.getenv("AURORA_MEMORY_THRESHOLD"):
-            config.metrics.memory_threshold = float(memory_threshold)
-
-        # Circuit Breaker
-        if failure_threshold := os.getenv("AURORA_CB_FAILURE_THRESHOLD"):
-            config.circuit_breaker.failure_threshold = int(failure_threshold)
-        if cb_timeout := os.getenv("AURORA_CB_TIMEOUT"):
-            config.circuit_breaker.timeout = float(cb_timeout)
-
-        # Rate Limiter
-        if rps := os.getenv("AURORA_RATE_LIMIT_RPS"):
-            config.rate_limiter.requests_per_second = float(rps)
+        As variáveis AURORA_* são lidas a cada chamada; só a conversão dos
+        valores é memoizada.
+        """
+        config = cls()
 
-        # Alertas
-        if email_recipients := os.getenv("AURORA_ALERT_EMAILS"):
-            config.alerts.email_recipients = email_recipients.split(",")
-            config.alerts.email_enabled = True
-        if slack_webhook := os.getenv("AURORA_SLACK_WEBHOOK"):
-            config.alerts.slack_webhook_url = slack_webhook
-            config.alerts.slack_enabled = True
+        environ = os.environ
+        values = tuple([environ.get(name) for name in _ENV_NAMES])
+        for section, name, value in _env_overrides(values):
+            target = config if section is None else getattr(config, section)
+            setattr(target, name, list(value) if type(value) is tuple else value)
 
         return config
 
     def to_dict(self) -> Dict[str, Any]:
-        """Converte configuração para dicionário."""
-        return {
-            "app_name": self.app_name,
-            "environment": self.environment,
-            "log_level": self.log_level.value,
-            "log_file": self.log_file,
-            "metrics": {
-                "enabled": self.metrics.enabled,
-                "collection_interval": self.metrics.collection_interval,
-                "cpu_threshold": self.metrics.cpu_threshold,
-                "memory_threshold": self.metrics.memory_threshold,
-                "disk_threshold": self.metrics.disk_threshold,
-                "network_error_threshold": self.metrics.network_error_threshold,
-                "include_process_metrics": self.metrics.include_process_metrics,
-                "history_size": self.metrics.history_size,
-            },
-            "anomaly": {
-                "enabled": self.anomaly.enabled,
-                "sensitivity": self.anomaly.sensitivity,
-                "min_samples": self.anomaly.min_samples,
-                "detection_window": self.anomaly.detection_window,
-                "spike_threshold": self.anomaly.spike_threshold,
-                "trend_window": self.anomaly.trend_window,
-            },
-            "circuit_breaker": {
-                "enabled": self.circuit_breaker.enabled,
-                "failure_threshold": self.circuit_breaker.failure_threshold,
-                "success_threshold": self.circuit_breaker.success_threshold,
-                "timeout": self.circuit_breaker.timeout,
-                "half_open_max_calls": self.circuit_breaker.half_open_max_calls,
-            },
-            "rate_limiter": {
-                "enabled": self.rate_limiter.enabled,
-                "requests_per_second": self.rate_limiter.requests_per_second,
-                "burst_size": self.rate_limiter.burst_size,
-                "per_client_limit": self.rate_limiter.per_client_limit,
-                "client_requests_per_second": self.rate_limiter.client_requests_per_second,
-                "client_burst_size": self.rate_limiter.client_burst_size,
-            },
-            "auto_healer": {
-                "enabled": self.auto_healer.enabled,
-                "max_heal_attempts": self.auto_healer.max_heal_attempts,
-                "heal_cooldown": self.auto_healer.heal_cooldown,
-                "gc_on_memory_pressure": self.auto_healer.gc_on_memory_pressure,
-                "gc_threshold": self.auto_healer.gc_threshold,
-                "restart_on_critical": self.auto_healer.restart_on_critical,
-            },
-            "watchdog": {
-                "enabled": self.watchdog.enabled,
-                "check_interval": self.watchdog.check_interval,
-                "heartbeat_timeout": self.watchdog.heartbeat_timeout,
-                "max_restarts": self.watchdog.max_restarts,
-                "restart_delay": self.watchdog.restart_delay,
-                "monitor_threads": self.watchdog.monitor_threads,
-                "deadlock_detection": self.watchdog.deadlock_detection,
-            },
-            "alerts": {
-                "enabled": self.alerts.enabled,
-                "email_enabled": self.alerts.email_enabled,
-                "slack_enabled": self.alerts.slack_enabled,
-                "webhook_enabled": self.alerts.webhook_enabled,
-                "alert_cooldown": self.alerts.alert_cooldown,
-                "aggregate_alerts": self.alerts.aggregate_alerts,
-            },
-            "health_check": {
-                "enabled": self.health_check.enabled,
-                "check_interval": self.health_check.check_interval,
-                "timeout": self.health_check.timeout,
-                "include_dependencies": self.health_check.include_dependencies,
-            },
-            "dashboard": {
-                "enabled": self.dashboard.enabled,
-                "host": self.dashboard.host,
-                "port": self.dashboard.port,
-                "auth_enabled": self.dashboard.auth_enabled,
-                "refresh_interval": self.dashboard.refresh_interval,
-            },
-            "custom_config": self.custom_config,
-        }
-
-    def save(self, path: str) -> None:
-        """Salva configuração em arquivo JSON."""
-        with open(path, "w") as f:
-            json.dump(self.to_dict(), f, indent=2)
+        """
+        Converte configuração para dicionário.
+
+        As chaves saem dos campos dos dataclasses, exceto os listados em
+        `_TO_DICT_EXCLUDED` (segredos e estruturas livres).
+
+        `custom_config` é devolvido por referência (sem cópia dos dados do
+        usuário): não altere o dicionário retornado se a configuração ainda
+        estiver em uso.
+        """
+        result: Dict[str, Any] = {}
+        for name, keys in _TO_DICT_FIELDS:
+            value = getattr(self, name)
+            if keys is not None:
+                value = {key: getattr(value, key) for key in keys}
+            result[name] = value
+        # Enum -> str simples, como nas versões anteriores
+        result["log_level"] = self.log_level.value
+        return result
+
+    def replace(self, **changes: Any) -> "MonitorConfig":
+        """
+        Cria uma cópia com os campos alterados, sem modificar esta instância.
+
+        Componentes aceitam um dicionário com alterações parciais, ex.:
+        `config.replace(app_name="x", metrics={"cpu_threshold": 80.0})`.
+        Componentes não alterados são compartilhados com o original.
+        """
+        for key, value in changes.items():
+            if key in _COMPONENT_FIELDS and type(value) is dict:
+                changes[key] = _dataclass_replace(getattr(self, key), **value)
+        return _dataclass_replace(self, **changes)
+
+    def save(self, path: str, pretty: bool = False) -> None:
+        """
+        Salva configuração em arquivo JSON.
+
+        Por padrão grava JSON compacto; `pretty=True` indenta para edição
+        manual (no json da stdlib, a indentação desativa o encoder em C).
+        """
+        dumps = _dumps_pretty if pretty else _dumps
+        with open(path, "wb") as f:
+            f.write(dumps(self.to_dict()))
 
     def validate(self) -> List[str]:
-        """Valida a configuração e retorna lista de problemas."""
-        issues = []
-
-        # Validações de thresholds
-        if not 0 <= self.metrics.cpu_threshold <= 100:
-            issues.append("cpu_threshold deve estar entre 0 e 100")
-        if not 0 <= self.metrics.memory_threshold <= 100:
-            issues.append("memory_threshold deve estar entre 0 e 100")
-        if not 0 <= self.metrics.disk_threshold <= 100:
-            issues.append("disk_threshold deve estar entre 0 e 100")
-
-        # Validações de intervalos
-        if self.metrics.collection_interval < 1:
-            issues.append("collection_interval deve ser >= 1 segundo")
-        if self.circuit_breaker.timeout < 1:
-            issues.append("circuit_breaker.timeout deve ser >= 1 segundo")
-        if self.rate_limiter.requests_per_second <= 0:
-            issues.append("requests_per_second deve ser > 0")
-
-        # Validações de contadores
-        if self.circuit_breaker.failure_threshold < 1:
-            issues.append("failure_threshold deve ser >= 1")
-        if self.circuit_breaker.success_threshold < 1:
-            issues.append("success_threshold deve ser >= 1")
-
+        """
+        Valida a configuração e retorna lista de problemas.
+
+        Componentes desabilitados não são validados.
+        """
+        issues: List[str] = []
+        for component_name, checks in _VALIDATORS:
+            component = getattr(self, component_name)
+            if not component.enabled:
+                continue
+            issues.extend(message for is_valid, message in checks if not is_valid(component))
         return issues
+
+
+# Despacho de MonitorConfig.from_dict, derivado dos campos do dataclass:
+# componentes (chave -> classe) e campos atribuídos diretamente. log_level
+# tem conversão própria (_log_level).
+_COMPONENT_FIELDS: Dict[str, type] = {
+    f.name: f.type for f in fields(MonitorConfig)
+    if isinstance(f.type, type) and is_dataclass(f.type)
+}
+_SCALAR_FIELDS: FrozenSet[str] = frozenset(
+    f.name for f in fields(MonitorConfig)
+    if f.name not in _COMPONENT_FIELDS and f.type is not LogLevel
+)
+
+# Regras de MonitorConfig.validate: componente -> ((predicado, mensagem), ...)
+_VALIDATORS: Tuple[Tuple[str, Tuple[Tuple[Callable[[Any], bool], str], ...]], ...] = (
+    ("metrics", (
+        # Thresholds
+        (lambda m: 0 <= m.cpu_threshold <= 100, "cpu_threshold deve estar entre 0 e 100"),
+        (lambda m: 0 <= m.memory_threshold <= 100, "memory_threshold deve estar entre 0 e 100"),
+        (lambda m: 0 <= m.disk_threshold <= 100, "disk_threshold deve estar entre 0 e 100"),
+        # Intervalos
+        (lambda m: m.collection_interval >= 1, "collection_interval deve ser >= 1 segundo"),
+    )),
+    ("circuit_breaker", (
+        (lambda cb: cb.timeout >= 1, "circuit_breaker.timeout deve ser >= 1 segundo"),
+        (lambda cb: cb.failure_threshold >= 1, "failure_threshold deve ser >= 1"),
+        (lambda cb: cb.success_threshold >= 1, "success_threshold deve ser >= 1"),
+    )),
+    ("rate_limiter", (
+        (lambda rl: rl.requests_per_second > 0, "requests_per_second deve ser > 0"),
+    )),
+)
+
+# Campos de componentes omitidos em MonitorConfig.to_dict: segredos,
+# destinatários e estruturas livres não vão para arquivos/dashboards
+_TO_DICT_EXCLUDED: Dict[str, FrozenSet[str]] = {
+    "circuit_breaker": frozenset({"excluded_exceptions"}),
+    "auto_healer": frozenset({"connection_pool_reset", "cache_clear_on_memory"}),
+    "alerts": frozenset({
+        "email_recipients", "slack_webhook_url", "custom_webhook_url", "aggregation_window",
+    }),
+    "health_check": frozenset({"custom_checks"}),
+    "dashboard": frozenset({"auth_token"}),
+}
+
+# (campo, chaves do componente ou None para valores simples), na ordem dos campos
+_TO_DICT_FIELDS: Tuple[Tuple[str, Optional[Tuple[str, ...]]], ...] = tuple(
+    (
+        f.name,
+        tuple(
+            sub.name for sub in fields(f.type)
+            if sub.name not in _TO_DICT_EXCLUDED.get(f.name, frozenset())
+        ) if is_dataclass(f.type) else None,
+    )
+    for f in fields(MonitorConfig)
+)
@@ -387,6 +387,9 @@ class AuroraMonitor:
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=5.0)
 
+        if self._metrics_collector:
+            self._metrics_collector.close()
+
         # Alerta de shutdown
         if self._alert_manager:
             self._alert_manager.send(
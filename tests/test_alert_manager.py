@@ -0,0 +1,387 @@
+"""
+Testes para o Alert Manager.
+"""
+
+import pytest
+import time
+from collections import deque
+from aurora_monitor.alerts.alert_manager import (
+    AlertManager,
+    AlertLevel,
+    Alert,
+)
+
+
+class TestAlertLevel:
+    """Testes do AlertLevel."""
+
+    def test_levels_are_ordered(self):
+        """Níveis devem seguir a ordem DEBUG < ... < CRITICAL."""
+        assert AlertLevel.DEBUG < AlertLevel.INFO < AlertLevel.WARNING
+        assert AlertLevel.WARNING < AlertLevel.ERROR < AlertLevel.CRITICAL
+        assert AlertLevel.ERROR >= AlertLevel.WARNING
+        assert AlertLevel.INFO <= AlertLevel.INFO
+        assert not AlertLevel.CRITICAL < AlertLevel.DEBUG
+
+    def test_value_is_level_name(self):
+        """Valor do enum continua sendo o nome do nível."""
+        assert AlertLevel.WARNING.value == "warning"
+        assert AlertLevel("critical") is AlertLevel.CRITICAL
+
+
+class TestAlertManager:
+    """Testes do AlertManager."""
+
+    def test_send_records_history(self):
+        """Alerta enviado deve entrar no histórico."""
+        manager = AlertManager()
+        alert = manager.send(AlertLevel.WARNING, "CPU alta", "CPU em 95%", "aurora.metrics")
+
+        assert isinstance(alert, Alert)
+        assert manager.get_history() == [alert]
+
+    def test_cooldown_suppresses_repeated_alert(self):
+        """Alerta repetido dentro do cooldown deve ser suprimido e agregado."""
+        manager = AlertManager()
+        manager.send(AlertLevel.ERROR, "Falha", "msg", "aurora.db")
+
+        assert manager.send(AlertLevel.ERROR, "Falha", "msg", "aurora.db") is None
+        assert len(manager.get_history()) == 1
+        assert manager.get_aggregates()[0].count == 1
+
+    def test_history_filters_by_min_level(self):
+        """get_history(level=...) deve filtrar por nível mínimo."""
+        manager = AlertManager()
+        manager.send(AlertLevel.INFO, "a", "msg", "aurora.x")
+        manager.send(AlertLevel.ERROR, "b", "msg", "aurora.x")
+        manager.send(AlertLevel.CRITICAL, "c", "msg", "aurora.x")
+
+        titles = [a.title for a in manager.get_history(level=AlertLevel.ERROR)]
+        assert titles == ["b", "c"]
+
+    def test_acknowledge(self):
+        """Alerta reconhecido sai da lista de não reconhecidos."""
+        manager = AlertManager()
+        alert = manager.send(AlertLevel.WARNING, "Disco", "90%", "aurora.disk")
+        manager.send(AlertLevel.ERROR, "Rede", "timeout", "aurora.net")
+
+        assert manager.acknowledge(alert.alert_id, by="ops") is True
+        assert alert.acknowledged_by == "ops"
+        assert [a.title for a in manager.get_unacknowledged()] == ["Rede"]
+        assert manager.acknowledge("inexistente") is False
+
+    def test_stats(self):
+        """get_stats deve contar por nível e por fonte."""
+        manager = AlertManager()
+        manager.send(AlertLevel.WARNING, "a", "msg", "aurora.metrics")
+        manager.send(AlertLevel.WARNING, "b", "msg", "aurora.disk")
+        manager.send(AlertLevel.ERROR, "c", "msg", "healer.process")
+
+        stats = manager.get_stats()
+        assert stats["total_alerts"] == 3
+        assert stats["unacknowledged"] == 3
+        assert stats["last_24_hours"] == 3
+        assert stats["by_level"] == {"warning": 2, "error": 1}
+        assert stats["by_source"] == {"aurora": 2, "healer": 1}
+
+    def test_sender_delivers_and_stops(self):
+        """Sender deve entregar alertas da fila e parar prontamente."""
+        from aurora_monitor.core.config import AlertConfig
+
+        manager = AlertManager(AlertConfig(webhook_enabled=True, custom_webhook_url="http://x"))
+        delivered = []
+        manager._send_to_channels = delivered.extend
+
+        alert = manager.send(AlertLevel.ERROR, "Falha", "msg", "aurora.db")
+        manager.stop()
+
+        assert delivered == [alert]
+        assert not manager._sender_thread.is_alive()
+
+    def test_webhook_batches_alerts(self, monkeypatch):
+        """Alertas na fila devem sair em um único POST para o webhook."""
+        import json
+        from aurora_monitor.core.config import AlertConfig
+
+        posts = []
+        manager = AlertManager(AlertConfig(webhook_enabled=True, custom_webhook_url="http://x"))
+        monkeypatch.setattr(manager, "_post_json",
+                            lambda url, data: posts.append(json.loads(data)))
+
+        alerts = [
+            Alert(level=AlertLevel.WARNING, title=f"t{i}", message="msg", source="aurora.x")
+            for i in range(3)
+        ]
+        manager._send_to_channels(alerts)
+        manager.stop()
+
+        assert len(posts) == 1
+        assert [a["title"] for a in posts[0]["alerts"]] == ["t0", "t1", "t2"]
+        assert all(a.sent_to == ["webhook"] for a in alerts)
+
+    def test_webhook_accepts_non_str_metadata_keys(self, monkeypatch):
+        """Metadata com chaves não-str deve ser serializada (chaves viram str)."""
+        import json
+        from aurora_monitor.core.config import AlertConfig
+
+        posts = []
+        manager = AlertManager(AlertConfig(webhook_enabled=True, custom_webhook_url="http://x"))
+        monkeypatch.setattr(manager, "_post_json",
+                            lambda url, data: posts.append(json.loads(data)))
+
+        alert = Alert(level=AlertLevel.ERROR, title="t", message="m", source="aurora.x",
+                      metadata={1: "a"})
+        manager._send_to_channels([alert])
+        manager.stop()
+
+        assert posts[0]["alerts"][0]["metadata"] == {"1": "a"}
+        assert alert.sent_to == ["webhook"]
+
+    def test_post_json_rejects_url_without_host(self):
+        """URL sem host deve gerar ValueError antes de abrir conexão."""
+        manager = AlertManager()
+        with pytest.raises(ValueError):
+            manager._post_json("http:///hook", b"{}")
+        manager.stop()
+
+    def test_post_json_uses_http_proxy(self, monkeypatch):
+        """Com HTTP_PROXY definido, o POST vai ao proxy com a URL absoluta."""
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        requests = []
+
+        class Proxy(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                requests.append((self.path, self.headers.get("Proxy-Authorization"), body))
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(("127.0.0.1", 0), Proxy)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        for name in ("http_proxy", "HTTP_PROXY", "no_proxy", "NO_PROXY"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("http_proxy", f"http://user:pw@127.0.0.1:{server.server_port}")
+
+        manager = AlertManager()
+        try:
+            manager._post_json("http://hooks.example/alertas?x=1", b'{"ok": 1}')
+        finally:
+            manager.stop()
+            server.shutdown()
+            server.server_close()
+
+        path, auth, body = requests[0]
+        assert path == "http://hooks.example/alertas?x=1"
+        assert auth == "Basic dXNlcjpwdw=="
+        assert body == b'{"ok": 1}'
+
+    def test_stuck_channel_holds_one_worker(self, monkeypatch):
+        """Canal com envio anterior ainda pendente é pulado até o envio terminar."""
+        import threading
+        from aurora_monitor.core.config import AlertConfig
+
+        manager = AlertManager(AlertConfig(webhook_enabled=True, custom_webhook_url="http://x"))
+        monkeypatch.setattr(manager, "CHANNEL_TIMEOUT", 0.05)
+        release = threading.Event()
+        calls = []
+
+        def post(url, data):
+            calls.append(url)
+            release.wait(5)
+
+        monkeypatch.setattr(manager, "_post_json", post)
+        alert = Alert(level=AlertLevel.ERROR, title="t", message="m", source="aurora.x")
+
+        manager._send_to_channels([alert])
+        manager._channel_retry_at.clear()  # ignora o backoff: testa só o envio pendente
+        manager._send_to_channels([alert])
+        assert calls == ["http://x"]
+
+        release.set()
+        manager._channel_inflight["webhook"].result(timeout=5)
+        manager._channel_retry_at.clear()
+        manager._send_to_channels([alert])
+        manager.stop()
+
+        assert calls == ["http://x", "http://x"]
+        assert manager._channel_inflight == {}
+
+    def test_send_to_channels_after_stop(self, monkeypatch):
+        """Envio tardio após stop() deve ocorrer em sequência, sem o pool."""
+        from aurora_monitor.core.config import AlertConfig
+
+        manager = AlertManager(AlertConfig(webhook_enabled=True, custom_webhook_url="http://x"))
+        manager.stop()
+        posts = []
+        monkeypatch.setattr(manager, "_post_json", lambda url, data: posts.append(url))
+
+        alert = Alert(level=AlertLevel.ERROR, title="t", message="m", source="aurora.x")
+        manager._send_to_channels([alert])
+
+        assert posts == ["http://x"]
+        assert alert.sent_to == ["webhook"]
+
+    def test_cooldown_expires(self):
+        """Após o cooldown o mesmo alerta volta a ser enviado."""
+        from aurora_monitor.core.config import AlertConfig
+
+        manager = AlertManager(AlertConfig(alert_cooldown=0.05))
+        assert manager.send(AlertLevel.ERROR, "Falha", "msg", "aurora.db") is not None
+        assert manager.send(AlertLevel.ERROR, "Falha", "msg", "aurora.db") is None
+
+        time.sleep(0.06)
+        assert manager.send(AlertLevel.ERROR, "Falha", "msg", "aurora.db") is not None
+
+    def test_expired_cooldowns_are_pruned(self):
+        """Chaves com cooldown expirado não devem se acumular em _last_sent."""
+        from aurora_monitor.core.config import AlertConfig
+
+        manager = AlertManager(AlertConfig(alert_cooldown=0.01))
+        manager.COOLDOWN_PRUNE_EVERY = 10
+        for i in range(9):
+            manager.send(AlertLevel.INFO, f"titulo {i}", "msg", "aurora.x")
+
+        time.sleep(0.02)
+        manager.send(AlertLevel.INFO, "novo", "msg", "aurora.x")
+
+        assert len(manager._last_sent) == 1
+
+    def test_history_limit_keeps_most_recent(self):
+        """get_history deve devolver os últimos `limit` alertas em ordem cronológica."""
+        manager = AlertManager()
+        for i in range(5):
+            manager.send(AlertLevel.INFO, f"t{i}", "msg", "aurora.x" if i % 2 else "healer.x")
+
+        assert [a.title for a in manager.get_history(limit=2)] == ["t3", "t4"]
+        assert [a.title for a in manager.get_history(limit=2, source="healer")] == ["t2", "t4"]
+        assert len(manager.get_history(limit=0)) == 5
+
+    def test_history_since(self):
+        """get_history(since=...) deve retornar só alertas a partir da data."""
+        from datetime import datetime
+
+        manager = AlertManager()
+        manager.send(AlertLevel.INFO, "antigo", "msg", "aurora.x")
+        time.sleep(0.01)
+        cutoff = datetime.now()
+        manager.send(AlertLevel.INFO, "novo", "msg", "aurora.x")
+
+        assert [a.title for a in manager.get_history(since=cutoff)] == ["novo"]
+        assert manager.get_history(since=datetime.now()) == []
+
+    def test_aggregate_keeps_last_alerts(self):
+        """Agregação deve contar tudo e guardar só os 10 alertas mais recentes."""
+        manager = AlertManager()
+        for i in range(15):
+            manager.send(AlertLevel.ERROR, "Falha", f"msg {i}", "aurora.db")
+
+        agg = manager.get_aggregates()[0]
+        assert agg.count == 14
+        assert len(agg.alerts) == 10
+        assert agg.alerts[-1].message == "msg 14"
+
+    def test_callbacks_receive_alert(self):
+        """Callbacks registrados devem receber o alerta; falhas são ignoradas."""
+        manager = AlertManager()
+        received = []
+        manager.on_alert(lambda alert: 1 / 0)
+        manager.on_alert(received.append)
+
+        alert = manager.send(AlertLevel.WARNING, "Fila", "cheia", "aurora.queue")
+
+        assert received == [alert]
+
+    def test_unacknowledged_by_level_after_eviction(self):
+        """Filtro por nível deve respeitar ordem e a evicção do histórico."""
+        manager = AlertManager()
+        manager._history = deque(maxlen=4)
+        levels = [AlertLevel.ERROR, AlertLevel.INFO, AlertLevel.CRITICAL,
+                  AlertLevel.ERROR, AlertLevel.WARNING, AlertLevel.CRITICAL]
+        for i, level in enumerate(levels):
+            manager.send(level, f"t{i}", "msg", "aurora.x")
+
+        titles = [a.title for a in manager.get_unacknowledged(level=AlertLevel.ERROR)]
+        assert titles == ["t2", "t3", "t5"]
+        assert len(manager.get_unacknowledged()) == 4
+
+    def test_failing_channel_backs_off(self, monkeypatch):
+        """Canal com falha entra em backoff sem bloquear os demais canais."""
+        from aurora_monitor.core.config import AlertConfig
+
+        manager = AlertManager(AlertConfig(
+            slack_enabled=True, slack_webhook_url="http://slack",
+            webhook_enabled=True, custom_webhook_url="http://hook",
+        ))
+        calls = []
+
+        def post(url, data):
+            calls.append(url)
+            if url == "http://slack":
+                raise OSError("down")
+
+        monkeypatch.setattr(manager, "_post_json", post)
+        alert = Alert(level=AlertLevel.ERROR, title="t", message="m", source="aurora.x")
+
+        manager._send_to_channels([alert])
+        manager._send_to_channels([alert])
+        manager.stop()
+
+        assert calls.count("http://slack") == 1
+        assert calls.count("http://hook") == 2
+        assert manager._channel_failures == {"slack": 1}
+
+    def test_slack_payload(self, monkeypatch):
+        """Payload do Slack deve ter um attachment por alerta com rótulo e cor."""
+        import json
+        from aurora_monitor.core.config import AlertConfig
+
+        posts = []
+        manager = AlertManager(AlertConfig(slack_enabled=True, slack_webhook_url="http://slack"))
+        monkeypatch.setattr(manager, "_post_json", lambda url, data: posts.append(json.loads(data)))
+
+        alert = Alert(level=AlertLevel.CRITICAL, title="Banco fora", message="m", source="aurora.db")
+        manager._send_to_slack([alert])
+        manager.stop()
+
+        attachment = posts[0]["attachments"][0]
+        assert attachment["title"] == "[CRITICAL] Banco fora"
+        assert attachment["color"] == "#ff0000"
+        assert str(alert) == "[CRITICAL] Banco fora: m"
+
+    def test_stats_follow_eviction_and_ack(self):
+        """Contadores de get_stats devem acompanhar evicção e reconhecimento."""
+        manager = AlertManager()
+        manager._history = deque(maxlen=3)
+        first = manager.send(AlertLevel.ERROR, "a", "msg", "healer.x")
+        manager.acknowledge(first.alert_id)
+        for title in ("b", "c", "d"):
+            manager.send(AlertLevel.INFO, title, "msg", "aurora.x")
+        manager.acknowledge(manager.get_history()[0].alert_id)
+
+        stats = manager.get_stats()
+        assert stats["total_alerts"] == 3
+        assert stats["unacknowledged"] == 2
+        assert stats["by_level"] == {"info": 3}
+        assert stats["by_source"] == {"aurora": 3}
+        assert stats["last_24_hours"] == 3
+
+        manager.clear_history()
+        assert manager.get_stats()["unacknowledged"] == 0
+
+    def test_stats_see_direct_acknowledgement(self):
+        """Marcar alert.acknowledged diretamente deve refletir em get_stats."""
+        manager = AlertManager()
+        alert = manager.send(AlertLevel.ERROR, "a", "msg", "aurora.x")
+        manager.send(AlertLevel.ERROR, "b", "msg", "aurora.x")
+
+        alert.acknowledged = True
+        assert manager.get_stats()["unacknowledged"] == 1
+
+        alert.acknowledged = False
+        assert manager.get_stats()["unacknowledged"] == 2
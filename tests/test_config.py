@@ -0,0 +1,177 @@
+"""
+Testes para a configuração do Aurora Monitor.
+"""
+
+import pytest
+from aurora_monitor.core.config import (
+    MonitorConfig,
+    MetricsConfig,
+    AlertConfig,
+    DashboardConfig,
+    LogLevel,
+)
+
+
+class TestMonitorConfig:
+    """Testes do MonitorConfig."""
+
+    def test_to_dict_includes_component_fields(self):
+        """to_dict deve refletir os campos dos componentes."""
+        config = MonitorConfig(
+            app_name="app",
+            log_level=LogLevel.DEBUG,
+            metrics=MetricsConfig(cpu_threshold=70.0),
+        )
+        data = config.to_dict()
+
+        assert data["app_name"] == "app"
+        assert data["log_level"] == "DEBUG"
+        assert type(data["log_level"]) is str
+        assert data["metrics"]["cpu_threshold"] == 70.0
+        assert data["metrics"]["history_size"] == 1000
+        assert list(data)[-1] == "custom_config"
+
+    def test_to_dict_custom_config_is_shallow(self):
+        """custom_config deve sair por referência, sem percorrer os dados do usuário."""
+        payload = {"nivel": {"profundo": [1, 2, 3]}}
+        config = MonitorConfig(custom_config=payload)
+
+        assert config.to_dict()["custom_config"] is payload
+
+    def test_to_dict_metrics_shape(self):
+        """metrics inclui os campos de coleta novos, para o save/load preservá-los."""
+        config = MonitorConfig(metrics=MetricsConfig(slow_collect_ratio=3))
+        data = config.to_dict()
+
+        assert list(data["metrics"]) == [
+            "enabled", "collection_interval", "cpu_threshold", "memory_threshold",
+            "disk_threshold", "network_error_threshold", "include_process_metrics",
+            "include_thread_names", "reuse_metrics_objects", "slow_collect_ratio",
+            "history_size",
+        ]
+        assert MonitorConfig.from_dict(data).metrics.slow_collect_ratio == 3
+
+    def test_to_dict_omits_secrets(self):
+        """Segredos e destinatários não devem ser serializados."""
+        config = MonitorConfig(
+            alerts=AlertConfig(slack_webhook_url="https://hooks/secret", email_recipients=["a@b"]),
+            dashboard=DashboardConfig(auth_token="token"),
+        )
+        data = config.to_dict()
+
+        assert "slack_webhook_url" not in data["alerts"]
+        assert "email_recipients" not in data["alerts"]
+        assert "auth_token" not in data["dashboard"]
+
+    def test_round_trip(self):
+        """from_dict(to_dict()) deve reproduzir a configuração serializada."""
+        config = MonitorConfig(app_name="app", environment="prod", log_level=LogLevel.ERROR)
+        config.metrics.history_size = 50
+        config.custom_config = {"feature": {"on": True}}
+
+        restored = MonitorConfig.from_dict(config.to_dict())
+
+        assert restored.to_dict() == config.to_dict()
+        assert restored.log_level is LogLevel.ERROR
+
+    def test_unknown_log_level(self):
+        """Nível de log desconhecido deve gerar ValueError."""
+        with pytest.raises(ValueError):
+            MonitorConfig.from_dict({"log_level": "VERBOSE"})
+
+    def test_from_env(self, monkeypatch):
+        """from_env deve ler variáveis AURORA_* e acompanhar mudanças no ambiente."""
+        monkeypatch.setenv("AURORA_APP_NAME", "via-env")
+        monkeypatch.setenv("AURORA_CPU_THRESHOLD", "75")
+        monkeypatch.setenv("AURORA_SLACK_WEBHOOK", "https://hooks/x")
+
+        config = MonitorConfig.from_env()
+        assert config.app_name == "via-env"
+        assert config.metrics.cpu_threshold == 75.0
+        assert config.alerts.slack_enabled is True
+
+        monkeypatch.setenv("AURORA_APP_NAME", "outro")
+        assert MonitorConfig.from_env().app_name == "outro"
+
+        monkeypatch.delenv("AURORA_APP_NAME")
+        assert MonitorConfig.from_env().app_name == "aurora-app"
+
+    def test_from_env_cache_does_not_share_state(self, monkeypatch):
+        """Chamadas de from_env com overrides em cache devem devolver objetos independentes."""
+        monkeypatch.setenv("AURORA_ALERT_EMAILS", "a@x,b@x")
+
+        first = MonitorConfig.from_env()
+        first.alerts.email_recipients.append("c@x")
+        first.metrics.cpu_threshold = 10.0
+
+        second = MonitorConfig.from_env()
+        assert second.alerts.email_recipients == ["a@x", "b@x"]
+        assert second.metrics.cpu_threshold == 85.0
+
+    def test_replace(self):
+        """replace deve criar uma cópia alterada sem tocar no original."""
+        config = MonitorConfig(app_name="original")
+        updated = config.replace(app_name="novo", metrics={"cpu_threshold": 60.0})
+
+        assert config.app_name == "original"
+        assert config.metrics.cpu_threshold == 85.0
+        assert updated.app_name == "novo"
+        assert updated.metrics.cpu_threshold == 60.0
+        assert updated.metrics.history_size == config.metrics.history_size
+        assert updated.alerts is config.alerts
+
+    def test_save_and_load(self, tmp_path):
+        """save/from_file devem preservar a configuração serializada."""
+        config = MonitorConfig(app_name="arquivo", log_level=LogLevel.WARNING)
+        config.custom_config = {"nome": "ação"}
+        path = tmp_path / "aurora.json"
+
+        config.save(str(path))
+        loaded = MonitorConfig.from_file(str(path))
+
+        assert loaded.to_dict() == config.to_dict()
+
+    def test_save_pretty(self, tmp_path):
+        """save grava JSON compacto por padrão e indentado com pretty=True."""
+        config = MonitorConfig(app_name="formato")
+        compact = tmp_path / "compacto.json"
+        pretty = tmp_path / "indentado.json"
+
+        config.save(str(compact))
+        config.save(str(pretty), pretty=True)
+
+        assert b"\n" not in compact.read_bytes()
+        assert b'\n  "app_name"' in pretty.read_bytes()
+        assert MonitorConfig.from_file(str(compact)).to_dict() == config.to_dict()
+        assert MonitorConfig.from_file(str(pretty)).to_dict() == config.to_dict()
+
+    def test_from_file_cache(self, tmp_path):
+        """Cargas em cache devem ser independentes e acompanhar mudanças no arquivo."""
+        path = tmp_path / "aurora.json"
+        config = MonitorConfig(app_name="v1")
+        config.custom_config = {"tags": ["a"]}
+        config.save(str(path))
+
+        first = MonitorConfig.from_file(str(path))
+        first.custom_config["tags"].append("b")
+        assert MonitorConfig.from_file(str(path)).custom_config == {"tags": ["a"]}
+
+        config.app_name = "versao-2"
+        config.save(str(path))
+        assert MonitorConfig.from_file(str(path)).app_name == "versao-2"
+
+    def test_validate(self):
+        """validate deve apontar valores inválidos só em componentes habilitados."""
+        config = MonitorConfig()
+        assert config.validate() == []
+
+        config.metrics.cpu_threshold = 150.0
+        config.circuit_breaker.failure_threshold = 0
+        config.rate_limiter.requests_per_second = 0
+        issues = config.validate()
+        assert "cpu_threshold deve estar entre 0 e 100" in issues
+        assert "failure_threshold deve ser >= 1" in issues
+        assert "requests_per_second deve ser > 0" in issues
+
+        config.rate_limiter.enabled = False
+        assert "requests_per_second deve ser > 0" not in config.validate()
@@ -0,0 +1,214 @@
+"""
+Testes para o Coletor de Métricas.
+"""
+
+import pytest
+import statistics
+from aurora_monitor.collectors.system import MetricsAggregate
+
+
+class TestMetricsAggregate:
+    """Testes do MetricsAggregate."""
+
+    def test_add_sample(self):
+        """Deve manter contagem, soma, mínimo, máximo e média."""
+        agg = MetricsAggregate(metric_name="cpu_percent")
+
+        for value in (10.0, 30.0, 20.0):
+            agg.add_sample(value)
+        agg.compute_stats()
+
+        assert agg.count == 3
+        assert agg.sum == 60.0
+        assert agg.min == 10.0
+        assert agg.max == 30.0
+        assert agg.avg == 20.0
+
+    def test_samples_are_bounded(self):
+        """Janela de amostras é limitada, mas os totais cobrem tudo."""
+        agg = MetricsAggregate(metric_name="cpu_percent")
+
+        for i in range(1500):
+            agg.add_sample(float(i))
+
+        assert len(agg.samples) == agg.samples.maxlen
+        assert agg.count == 1500
+        assert agg.min == 0.0
+        assert agg.max == 1499.0
+
+    def test_compute_stats(self):
+        """Desvio padrão e percentis devem ser calculados sobre a janela."""
+        agg = MetricsAggregate(metric_name="memory_percent")
+
+        for i in range(100):
+            agg.add_sample(float(i))
+        agg.compute_stats()
+
+        assert agg.std_dev == pytest.approx(statistics.stdev(range(100)))
+        assert agg.percentile_50 == 50.0
+        assert agg.percentile_90 == 90.0
+        assert agg.percentile_99 == 99.0
+
+    def test_streaming_percentiles_after_window(self):
+        """Além da janela, percentis são estimados sobre todas as amostras."""
+        agg = MetricsAggregate(metric_name="cpu_percent")
+
+        for i in range(5000):
+            agg.add_sample(float(i))
+        agg.compute_stats()
+
+        assert agg.percentile_50 == pytest.approx(2500, rel=0.02)
+        assert agg.percentile_90 == pytest.approx(4500, rel=0.02)
+        assert agg.percentile_99 == pytest.approx(4950, rel=0.02)
+
+    def test_compute_stats_single_sample(self):
+        """Com uma amostra o desvio padrão é zero."""
+        agg = MetricsAggregate(metric_name="disk_percent")
+        agg.add_sample(42.0)
+        agg.compute_stats()
+
+        assert agg.std_dev == 0.0
+        assert agg.percentile_99 == 42.0
+
+
+class TestProcParsers:
+    """Testes dos parsers de /proc usados sem psutil."""
+
+    def test_meminfo(self):
+        """Deve extrair chaves simples de /proc/meminfo."""
+        from aurora_monitor.collectors.metrics import _MEMINFO_RE
+
+        data = b"MemTotal:       16000 kB\nMemFree:         4000 kB\nActive(anon):    10 kB\n"
+        assert dict(_MEMINFO_RE.findall(data)) == {b"MemTotal": b"16000", b"MemFree": b"4000"}
+
+    def test_net_dev(self):
+        """Deve extrair colunas rx/tx por interface de /proc/net/dev."""
+        from aurora_monitor.collectors.metrics import _NETDEV_RE
+
+        data = (
+            b"Inter-|   Receive |  Transmit\n"
+            b" face |bytes packets errs drop fifo frame compressed multicast|bytes ...\n"
+            b"    lo: 500 5 0 0 0 0 0 0 500 5 0 0 0 0 0 0\n"
+            b"  eth0: 1230 18 1 0 0 0 0 0 1597 19 2 0 0 0 0 0\n"
+        )
+        rows = _NETDEV_RE.findall(data)
+        assert rows[1] == (b"eth0", b"1230", b"18", b"1", b"1597", b"19", b"2")
+        assert [row[0] for row in rows] == [b"lo", b"eth0"]
+
+
+class TestMetricsCollector:
+    """Testes do MetricsCollector."""
+
+    def test_history_ring(self):
+        """Histórico deve manter só as últimas `history_size` coletas, em ordem."""
+        from aurora_monitor.collectors.metrics import MetricsCollector
+        from aurora_monitor.core.config import MetricsConfig
+
+        collector = MetricsCollector(MetricsConfig(history_size=3))
+        assert collector.get_latest() is None
+        assert collector.get_history() == []
+
+        collected = [collector.collect() for _ in range(5)]
+
+        assert collector.get_history() == collected[-3:]
+        assert collector.get_history(2) == collected[-2:]
+        assert collector.get_latest() is collected[-1]
+
+        collector.clear_history()
+        assert collector.get_history() == []
+        assert collector.get_rate("network_bytes_sent") == 0.0
+
+    def test_collect_after_close(self):
+        """Após close() a coleta continua, sem o pool de threads."""
+        from aurora_monitor.collectors.metrics import MetricsCollector
+
+        collector = MetricsCollector()
+        first = collector.collect()
+        collector.close()
+        second = collector.collect()
+
+        assert collector._pool is None
+        assert second.process.pid == first.process.pid
+        assert collector.get_history() == [first, second]
+
+    def test_get_rate(self):
+        """Taxa deve aceitar nomes simples e aninhados; nomes inválidos dão 0."""
+        from aurora_monitor.collectors.metrics import MetricsCollector
+
+        collector = MetricsCollector()
+        previous = collector.collect()
+        latest = collector.collect()
+        previous.network_bytes_sent, latest.network_bytes_sent = 1000, 3000
+        previous.network.errors_in, latest.network.errors_in = 0, 10
+        latest.timestamp_ns = previous.timestamp_ns + 2_000_000_000
+
+        assert collector.get_rate("network_bytes_sent") == 1000.0
+        assert collector.get_rate("network.errors_in") == 5.0
+        assert collector.get_rate("inexistente") == 0.0
+
+    def test_get_rate_without_monotonic_timestamp(self):
+        """Amostras sem timestamp_ns usam o timestamp de parede."""
+        from datetime import timedelta
+        from aurora_monitor.collectors.metrics import MetricsCollector
+
+        collector = MetricsCollector()
+        previous = collector.collect()
+        latest = collector.collect()
+        previous.timestamp_ns = latest.timestamp_ns = 0
+        previous.network_bytes_recv, latest.network_bytes_recv = 0, 400
+        latest.timestamp = previous.timestamp + timedelta(seconds=4)
+
+        assert collector.get_rate("network_bytes_recv") == 100.0
+
+    def test_thread_names_opt_in(self):
+        """Nomes das threads só são coletados com include_thread_names."""
+        import threading
+        from aurora_monitor.collectors.metrics import MetricsCollector
+        from aurora_monitor.core.config import MetricsConfig
+
+        default = MetricsCollector().collect()
+        assert default.threads.active_count >= 1
+        assert default.threads.alive_threads == []
+
+        named = MetricsCollector(MetricsConfig(include_thread_names=True)).collect()
+        assert threading.current_thread().name in named.threads.alive_threads
+
+    def test_pool_threads_not_counted(self):
+        """Threads do pool de coleta ficam fora das métricas; o with fecha o pool."""
+        import threading
+        from aurora_monitor.collectors.metrics import MetricsCollector
+        from aurora_monitor.core.config import MetricsConfig
+
+        with MetricsCollector(MetricsConfig(include_thread_names=True)) as collector:
+            collector.collect()
+            metrics = collector.collect()
+            pool_threads = [
+                t for t in threading.enumerate()
+                if t.name.startswith(MetricsCollector.POOL_THREAD_PREFIX)
+            ]
+            assert pool_threads
+            assert metrics.threads.active_count == threading.active_count() - len(pool_threads)
+            assert not any(
+                name.startswith(MetricsCollector.POOL_THREAD_PREFIX)
+                for name in metrics.threads.alive_threads
+            )
+
+        assert collector._pool is None
+
+    def test_reuse_metrics_objects(self):
+        """Com reuse_metrics_objects, objetos que saem do histórico são reciclados."""
+        from aurora_monitor.collectors.metrics import MetricsCollector
+        from aurora_monitor.core.config import MetricsConfig
+
+        collector = MetricsCollector(MetricsConfig(history_size=2, reuse_metrics_objects=True))
+        collected = [collector.collect() for _ in range(5)]
+
+        # O slot extra do ring faz o primeiro objeto voltar na 5ª coleta
+        assert collected[4] is collected[0]
+        assert collector.get_history() == [collected[3], collected[4]]
+        assert collected[4].hostname
+        assert collected[4].timestamp_ns > collected[3].timestamp_ns
+
+        default = MetricsCollector(MetricsConfig(history_size=2))
+        objs = [default.collect() for _ in range(5)]
+        assert len({id(m) for m in objs}) == 5